@@ -9,7 +9,9 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.api.app import main
-
 if __name__ == "__main__":
+    # Imported here so spawned worker processes, which re-import this
+    # script, do not load the whole API stack
+    from src.api.app import main
+
     main()
\ No newline at end of file
@@ -8,7 +8,8 @@ from pathlib import Path
 import uvicorn
 
 from ..config import settings
-from ..utils import setup_logging
+from ..llm.http_pool import close_http_clients
+from ..utils import setup_logging, shutdown_hash_executor
 from .middleware import setup_middleware
 from .routes import email_router, person_router, project_router
 from .routes.auth_routes import auth_router
@@ -26,6 +27,22 @@ request_duration = Histogram('http_request_duration_seconds', 'HTTP request dura
 logger = setup_logging("API")
 
 
+async def _session_cleanup_loop(interval_seconds: float):
+    """Periodically delete expired sessions outside the request path"""
+    from ..database.connection import db_manager
+    from ..database.auth_repositories import SessionRepository
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with db_manager.get_session() as session:
+                removed = await SessionRepository(session).cleanup_expired()
+            if removed:
+                logger.info(f"Removed {removed} expired sessions")
+        except Exception as e:
+            logger.error(f"Session cleanup failed: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
@@ -43,10 +60,25 @@ async def lifespan(app: FastAPI):
     logger.info(f"MCP Server initialized: {mcp_server.name}")
     logger.info(f"Vector database connected: {vector_db.collection_name}")
     
+    # Expired session cleanup runs on a timer instead of per request
+    cleanup_task = None
+    if settings.session_cleanup_interval_minutes > 0:
+        cleanup_task = asyncio.create_task(
+            _session_cleanup_loop(settings.session_cleanup_interval_minutes * 60)
+        )
+    
     yield
     
     # Shutdown
     logger.info("Shutting down MCP Server API...")
+    if cleanup_task is not None:
+        cleanup_task.cancel()
+        try:
+            await cleanup_task
+        except asyncio.CancelledError:
+            pass
+    shutdown_hash_executor()
+    await close_http_clients()
 
 
 # Create FastAPI app
@@ -262,9 +262,8 @@ async def change_password(
         )
     
     # Update password
-    from passlib.context import CryptContext
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-    user.password_hash = pwd_context.hash(request.new_password)
+    from src.utils import get_password_hash_async
+    user.password_hash = await get_password_hash_async(request.new_password)
     
     await db.commit()
     
@@ -57,13 +57,13 @@ async def list_documents(
     # Calculate offset
     offset = (page - 1) * size
     
-    # Get documents
-    documents = await repo.get_all(skip=offset, limit=size)
     total = await repo.count()
     
-    # Convert to response format
+    # Rows are streamed from the database, but the page (at most 100 items)
+    # is still built in full: the session closes before a streaming
+    # response body would be sent
     items = []
-    for doc in documents:
+    async for doc in repo.iter_all(skip=offset, limit=size):
         items.append(DocumentResponse(
             id=doc.id,
             title=doc.title,
@@ -195,7 +195,6 @@ async def list_users(
     from src.database.user_repository import UserRepository
     
     repo = UserRepository(db)
-    users = await repo.get_all(limit=100)
     
     return [
         {
@@ -205,5 +204,5 @@ async def list_users(
             "is_active": user.is_active,
             "roles": [role.name for role in user.roles] if user.roles else []
         }
-        for user in users
+        async for user in repo.iter_all(limit=100)
     ]
\ No newline at end of file
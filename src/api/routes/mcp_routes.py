@@ -2,7 +2,10 @@
 MCP (Model Context Protocol) tools and resources API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
 
 from ..base_schemas import (
     ToolExecutionRequest, ToolExecutionResponse, ToolListResponse, ToolInfo,
@@ -41,6 +44,24 @@ async def list_tools(
     )
 
 
+@tools_router.get("/read_file/raw", response_class=FileResponse)
+async def read_file_raw(
+    path: str = Query(..., description="Path to the file"),
+    user=Depends(check_rate_limit),
+):
+    """Stream a file's raw bytes (the binary counterpart of the read_file tool)"""
+    file_path = Path(path)
+    if not file_path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"File not found: {path}",
+        )
+    
+    # Sent straight from disk (zero-copy where the server supports pathsend)
+    # instead of being decoded to str and escaped into a JSON payload
+    return FileResponse(file_path, filename=file_path.name)
+
+
 @tools_router.post("/{tool_name}/execute", response_model=ToolExecutionResponse)
 async def execute_tool(
     tool_name: str,
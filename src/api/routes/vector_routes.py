@@ -96,7 +96,9 @@ async def ingest_documents(
     """Ingest documents into vector database"""
     try:
         with Timer() as timer:
-            document_ids = search_engine.index_documents(
+            # Batches are embedded and written on worker threads, keeping the
+            # event loop free during ingestion
+            document_ids = await search_engine.database.add_documents_async(
                 documents=request.documents,
                 metadatas=request.metadatas,
                 ids=request.ids,
@@ -19,6 +19,9 @@ class Settings(BaseSettings):
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = Field(
         default="INFO", description="Logging level"
     )
+    thread_pool_size: int = Field(
+        default=64, description="Threads for blocking MCP tool and resource handlers"
+    )
 
     # API Configuration
     api_prefix: str = Field(default="/api/v1", description="API prefix")
@@ -45,6 +48,10 @@ class Settings(BaseSettings):
         default=30, description="JWT expiration in minutes (ignored if simple auth enabled)"
     )
 
+    password_hash_workers: int = Field(
+        default=2, description="Worker processes for password hashing (0 = CPU count)"
+    )
+
     # Vector Database Configuration
     chroma_persist_directory: Path = Field(
         default=Path("./data/chroma"), description="ChromaDB persist directory"
@@ -55,6 +62,51 @@ class Settings(BaseSettings):
     embedding_model: str = Field(
         default="all-MiniLM-L6-v2", description="Sentence transformer model"
     )
+    embedding_device: Optional[str] = Field(
+        default=None, description="Device for the embedding model, e.g. cpu or cuda (auto-detected if unset)"
+    )
+    embedding_backend: Literal["torch", "onnx", "openvino"] = Field(
+        default="torch", description="Inference backend for the embedding model"
+    )
+    embedding_model_file: Optional[str] = Field(
+        default=None, description="Exported model file for the onnx or openvino backend, e.g. onnx/model_qint8_avx512.onnx"
+    )
+    embedding_threads: Optional[int] = Field(
+        default=None, description="Torch intra-op threads for embedding (min(CPUs, 8) if unset)"
+    )
+    embedding_half_precision: bool = Field(
+        default=False, description="Run the embedding model in fp16 when it is on a GPU"
+    )
+    embedding_dtype: Literal["float32", "float16"] = Field(
+        default="float32",
+        description=(
+            "Floating point type of in-process embeddings (Chroma stores float32); "
+            "float16 halves memory but rounds similarity scores to ~3 significant "
+            "digits, which can reorder near-ties"
+        ),
+    )
+    embedding_compile: bool = Field(
+        default=False, description="Compile the torch embedding model with torch.compile"
+    )
+    embedding_batch_size: int = Field(
+        default=64, description="Documents embedded and written per vector DB batch"
+    )
+    max_concurrent_embed: int = Field(
+        default=4, description="Vector DB batches embedded and written concurrently"
+    )
+    cache_queries: bool = Field(
+        default=True,
+        description=(
+            "Cache vector DB query results until a write through this instance or "
+            "query_cache_ttl; writes by other processes to the same persist "
+            "directory are only seen once entries expire"
+        ),
+    )
+    query_cache_size: int = Field(default=256, description="Cached vector DB queries")
+    query_cache_ttl: int = Field(
+        default=30,
+        description="Seconds a cached vector DB query result may be served",
+    )
 
     # LLM API Keys
     openai_api_key: Optional[str] = Field(default=None, description="OpenAI API key")
@@ -77,6 +129,20 @@ class Settings(BaseSettings):
         default="sqlite:///./data/mcp.db", description="Database URL"
     )
 
+    database_pool_size: int = Field(default=20, description="Database connection pool size")
+    database_max_overflow: int = Field(
+        default=10, description="Connections allowed beyond the pool size"
+    )
+    database_pool_timeout: int = Field(
+        default=30, description="Seconds to wait for a pooled connection"
+    )
+    database_pool_recycle: int = Field(
+        default=1800, description="Seconds before a pooled connection is recycled"
+    )
+    session_cleanup_interval_minutes: int = Field(
+        default=15, description="Interval between expired session cleanup runs (0 disables)"
+    )
+
     # Redis
     redis_url: Optional[str] = Field(
         default="redis://localhost:6379/0", description="Redis URL"
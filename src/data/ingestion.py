@@ -6,7 +6,7 @@ import logging
 from dataclasses import dataclass
 from enum import Enum
 
-from ..utils import setup_logging, chunk_text, hash_text, generate_id
+from ..utils import setup_logging, chunk_text, fingerprint_text, hash_text, generate_id
 from .transformers import DataTransformer, DataCleaner
 
 
@@ -285,7 +285,7 @@ class DocumentIngestionPipeline:
         """Process a single document through the pipeline"""
         # Check for duplicates
         if self.enable_deduplication:
-            content_hash = hash_text(document.content)
+            content_hash = fingerprint_text(document.content)
             if content_hash in self.processed_hashes:
                 logger.debug(f"Skipping duplicate document: {document.id}")
                 return None
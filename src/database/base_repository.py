@@ -1,5 +1,8 @@
-from typing import Generic, TypeVar, Type, Optional, List
-from sqlalchemy import select, func
+from functools import lru_cache
+from typing import Generic, TypeVar, Type, Optional, List, AsyncIterator, FrozenSet
+from sqlalchemy import select, func, inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .models import Base
@@ -8,12 +11,19 @@ from .models import Base
 ModelType = TypeVar("ModelType", bound=Base)
 
 
+@lru_cache(maxsize=None)
+def _mapped_attribute_keys(model: type) -> FrozenSet[str]:
+    """Names of mapped attributes (columns, relationships, hybrids) on a model"""
+    return frozenset(inspect(model).all_orm_descriptors.keys())
+
+
 class BaseRepository(Generic[ModelType]):
     """Base repository with common CRUD operations"""
     
     def __init__(self, model: Type[ModelType], session: AsyncSession):
         self.model = model
         self.session = session
+        self._attribute_keys = _mapped_attribute_keys(model)
     
     async def create(self, **kwargs) -> ModelType:
         """Create a new record"""
@@ -35,17 +45,49 @@ class BaseRepository(Generic[ModelType]):
         **filters
     ) -> List[ModelType]:
         """Get all records with optional filtering"""
-        stmt = select(self.model)
-        
-        # Apply filters
-        for key, value in filters.items():
-            if hasattr(self.model, key):
-                stmt = stmt.where(getattr(self.model, key) == value)
-        
+        stmt = self._apply_filters(select(self.model), filters)
         stmt = stmt.offset(skip).limit(limit)
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
     
+    async def iter_all(
+        self,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        batch_size: int = 500,
+        **filters
+    ) -> AsyncIterator[ModelType]:
+        """Stream records with optional filtering, fetching in batches"""
+        stmt = self._apply_filters(select(self.model), filters)
+        if skip:
+            stmt = stmt.offset(skip)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        async for instance in self._stream(stmt, batch_size):
+            yield instance
+    
+    async def _stream(self, stmt, batch_size: int = 500) -> AsyncIterator[ModelType]:
+        """Yield ORM instances for a statement without buffering the full result"""
+        result = await self.session.stream_scalars(
+            stmt.execution_options(yield_per=batch_size)
+        )
+        async for instance in result:
+            yield instance
+    
+    def _insert(self, table=None):
+        """Build a dialect-specific INSERT that supports ON CONFLICT clauses"""
+        table = self.model if table is None else table
+        if self.session.get_bind().dialect.name == "sqlite":
+            return sqlite_insert(table)
+        return pg_insert(table)
+    
+    def _apply_filters(self, stmt, filters: dict):
+        """Apply equality filters for attributes that exist on the model"""
+        for key, value in filters.items():
+            if key in self._attribute_keys:
+                stmt = stmt.where(getattr(self.model, key) == value)
+        return stmt
+    
     async def update(self, id: str, data: dict = None, **kwargs) -> Optional[ModelType]:
         """Update a record"""
         instance = await self.get(id)
@@ -53,7 +95,7 @@ class BaseRepository(Generic[ModelType]):
             # Handle both dict and kwargs
             update_data = data if data else kwargs
             for key, value in update_data.items():
-                if hasattr(instance, key):
+                if key in self._attribute_keys:
                     # Skip None values to preserve existing data
                     # This is important for partial updates
                     if value is not None:
@@ -72,11 +114,6 @@ class BaseRepository(Generic[ModelType]):
     
     async def count(self, **filters) -> int:
         """Count records with optional filtering"""
-        stmt = select(func.count()).select_from(self.model)
-        
-        for key, value in filters.items():
-            if hasattr(self.model, key):
-                stmt = stmt.where(getattr(self.model, key) == value)
-        
+        stmt = self._apply_filters(select(func.count()).select_from(self.model), filters)
         result = await self.session.execute(stmt)
         return result.scalar() or 0
\ No newline at end of file
@@ -9,14 +9,20 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
 )
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
 from sqlalchemy import event, MetaData
+from prometheus_client import Gauge
 
 from ..config import settings
 from ..utils import setup_logging
 
 logger = setup_logging("Database.Connection")
 
+# Metrics
+db_pool_checked_out = Gauge(
+    'db_pool_connections_checked_out', 'Database connections currently checked out'
+)
+
 # Create base class for models with naming conventions
 convention = {
     "ix": "ix_%(column_0_label)s",
@@ -66,14 +72,20 @@ class DatabaseManager:
         else:
             # Connection pool settings for PostgreSQL
             engine_kwargs.update({
-                "pool_size": 20,
-                "max_overflow": 10,
+                "poolclass": AsyncAdaptedQueuePool,
+                "pool_size": settings.database_pool_size,
+                "max_overflow": settings.database_max_overflow,
+                "pool_timeout": settings.database_pool_timeout,
                 "pool_pre_ping": True,
-                "pool_recycle": 3600,
+                "pool_recycle": settings.database_pool_recycle,
             })
         
         self._engine = create_async_engine(self.database_url, **engine_kwargs)
         
+        pool = self._engine.sync_engine.pool
+        if hasattr(pool, "checkedout"):
+            db_pool_checked_out.set_function(pool.checkedout)
+        
         # Create sessionmaker
         self._sessionmaker = async_sessionmaker(
             self._engine,
@@ -1,10 +1,11 @@
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Union
+from uuid import uuid4
 from sqlalchemy import select, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .base_repository import BaseRepository
 from .models import Document, Tag, document_tags
-from ..utils import setup_logging, hash_text
+from ..utils import setup_logging, hash_text_digest
 
 logger = setup_logging("Database.DocumentRepositories")
 
@@ -16,23 +17,37 @@ class DocumentRepository(BaseRepository[Document]):
         super().__init__(Document, session)
     
     async def create_with_hash(self, content: str, **kwargs) -> Document:
-        """Create document with content hash"""
-        content_hash = hash_text(content)
-        
-        # Check for duplicates
-        existing = await self.get_by_hash(content_hash)
-        if existing:
-            logger.warning(f"Document with same content already exists: {existing.id}")
-            return existing
-        
-        return await self.create(
-            content=content,
-            content_hash=content_hash,
-            **kwargs
+        """Create document with content hash, returning the existing row on duplicates"""
+        # The ID is chosen here so a returned row with a different ID
+        # identifies a duplicate
+        document_id = kwargs.pop("id", None) or str(uuid4())
+        insert = self._insert()
+        stmt = (
+            insert.values(
+                id=document_id,
+                content=content,
+                content_hash=hash_text_digest(content),
+                **kwargs
+            )
+            # No-op update so RETURNING yields the existing row on conflict
+            .on_conflict_do_update(
+                index_elements=["content_hash"],
+                set_={"content_hash": insert.excluded.content_hash}
+            )
+            .returning(Document)
         )
+        result = await self.session.execute(
+            stmt, execution_options={"populate_existing": True}
+        )
+        document = result.scalar_one()
+        if document.id != document_id:
+            logger.warning(f"Document with same content already exists: {document.id}")
+        return document
     
-    async def get_by_hash(self, content_hash: str) -> Optional[Document]:
-        """Get document by content hash"""
+    async def get_by_hash(self, content_hash: Union[bytes, str]) -> Optional[Document]:
+        """Get document by raw SHA256 digest (hex strings are also accepted)"""
+        if isinstance(content_hash, str):
+            content_hash = bytes.fromhex(content_hash)
         stmt = select(Document).where(Document.content_hash == content_hash)
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
@@ -96,6 +111,42 @@ class DocumentRepository(BaseRepository[Document]):
         return False
 
 
+    async def add_tags_bulk(self, doc_tag_pairs: List[Tuple[str, str]]) -> int:
+        """Add (document_id, tag_name) pairs in bulk, creating missing tags.
+        
+        Uses set-based inserts instead of per-tag lookups. Tag collections
+        already loaded in the session are not refreshed.
+        """
+        pairs = set(doc_tag_pairs)
+        if not pairs:
+            return 0
+        
+        # Create any missing tags in one statement
+        names = {tag_name for _, tag_name in pairs}
+        await self.session.execute(
+            self._insert(Tag)
+            .values([{"id": str(uuid4()), "name": name} for name in names])
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        
+        result = await self.session.execute(
+            select(Tag.name, Tag.id).where(Tag.name.in_(names))
+        )
+        tag_ids = dict(result.all())
+        
+        # Link documents to tags, skipping existing memberships
+        result = await self.session.execute(
+            self._insert(document_tags)
+            .values([
+                {"document_id": document_id, "tag_id": tag_ids[tag_name]}
+                for document_id, tag_name in pairs
+            ])
+            .on_conflict_do_nothing()
+        )
+        await self.session.flush()
+        return result.rowcount
+
+
 class TagRepository(BaseRepository[Tag]):
     """Repository for Tag operations"""
     
@@ -110,12 +161,21 @@ class TagRepository(BaseRepository[Tag]):
     
     async def get_popular(self, limit: int = 10) -> List[Tuple[Tag, int]]:
         """Get most popular tags with document count"""
-        stmt = (
-            select(Tag, func.count(document_tags.c.document_id).label("doc_count"))
-            .outerjoin(document_tags)
-            .group_by(Tag.id)
-            .order_by(func.count(document_tags.c.document_id).desc())
+        # Aggregate and limit on the association table before touching tags
+        counts = (
+            select(
+                document_tags.c.tag_id,
+                func.count().label("doc_count")
+            )
+            .group_by(document_tags.c.tag_id)
+            .order_by(func.count().desc())
             .limit(limit)
+            .subquery()
+        )
+        stmt = (
+            select(Tag, counts.c.doc_count)
+            .join(counts, counts.c.tag_id == Tag.id)
+            .order_by(counts.c.doc_count.desc())
         )
         result = await self.session.execute(stmt)
         return list(result.all())
\ No newline at end of file
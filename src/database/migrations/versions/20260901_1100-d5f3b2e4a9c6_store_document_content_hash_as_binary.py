@@ -0,0 +1,39 @@
+"""Store document content hash as binary digest
+
+Revision ID: d5f3b2e4a9c6
+Revises: c4e2a1d3f8b5
+Create Date: 2026-09-01 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f3b2e4a9c6'
+down_revision: Union[str, None] = 'c4e2a1d3f8b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows hold hex-encoded SHA256 strings; decode them in place
+    op.alter_column(
+        'documents', 'content_hash',
+        existing_type=sa.String(length=64),
+        type_=sa.LargeBinary(length=32),
+        existing_nullable=False,
+        postgresql_using="decode(content_hash, 'hex')",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'documents', 'content_hash',
+        existing_type=sa.LargeBinary(length=32),
+        type_=sa.String(length=64),
+        existing_nullable=False,
+        postgresql_using="encode(content_hash, 'hex')",
+    )
@@ -4,8 +4,8 @@ from uuid import uuid4
 import json
 
 from sqlalchemy import (
-    Column, String, Integer, Float, Boolean, DateTime, Text, JSON,
-    ForeignKey, Index, UniqueConstraint, CheckConstraint, Table
+    Column, String, Integer, Float, Boolean, DateTime, Text, JSON, LargeBinary,
+    ForeignKey, Index, UniqueConstraint, CheckConstraint, Table, text
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship, Mapped, mapped_column
@@ -28,6 +28,7 @@ document_tags = Table(
     Base.metadata,
     Column("document_id", ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True),
     Column("tag_id", ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_document_tags_tag_id", "tag_id"),
 )
 
 
@@ -113,6 +114,12 @@ class Role(Base, TimestampMixin):
 class ApiKey(Base, TimestampMixin):
     """API key model for authentication"""
     __tablename__ = "api_keys"
+    __table_args__ = (
+        Index(
+            "ix_api_keys_active_key_hash", "key_hash",
+            postgresql_where=text("is_active"), sqlite_where=text("is_active")
+        ),
+    )
     
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
     key_hash: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
@@ -146,7 +153,7 @@ class Document(Base, TimestampMixin):
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
-    content_hash: Mapped[str] = mapped_column(String(64), unique=True, index=True)
+    content_hash: Mapped[bytes] = mapped_column(LargeBinary(32), unique=True, index=True)
     
     # Vector store reference
     vector_id: Mapped[Optional[str]] = mapped_column(String(100), index=True)
@@ -201,6 +208,12 @@ class Tag(Base, TimestampMixin):
 class Tool(Base, TimestampMixin):
     """Custom tool definitions"""
     __tablename__ = "tools"
+    __table_args__ = (
+        Index(
+            "ix_tools_active_name", "name",
+            postgresql_where=text("is_active"), sqlite_where=text("is_active")
+        ),
+    )
     
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False, index=True)
@@ -226,6 +239,12 @@ class Tool(Base, TimestampMixin):
 class Resource(Base, TimestampMixin):
     """Custom resource definitions"""
     __tablename__ = "resources"
+    __table_args__ = (
+        Index(
+            "ix_resources_active_uri", "uri",
+            postgresql_where=text("is_active"), sqlite_where=text("is_active")
+        ),
+    )
     
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
     uri: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
@@ -333,6 +352,11 @@ class Session(Base, TimestampMixin):
     __tablename__ = "sessions"
     __table_args__ = (
         Index("ix_sessions_user_active", "user_id", "is_active"),
+        Index("ix_sessions_expires_at", "expires_at"),
+        Index(
+            "ix_sessions_active_token_hash", "token_hash",
+            postgresql_where=text("is_active"), sqlite_where=text("is_active")
+        ),
     )
     
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
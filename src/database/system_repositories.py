@@ -1,4 +1,4 @@
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, AsyncIterator
 from datetime import datetime, timedelta, UTC
 
 from sqlalchemy import select, and_, func
@@ -150,6 +150,23 @@ class AuditLogRepository(BaseRepository[AuditLog]):
         limit: int = 100
     ) -> List[AuditLog]:
         """Get user's recent activity"""
+        stmt = self._user_activity_stmt(user_id, days, limit)
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+    
+    async def iter_user_activity(
+        self,
+        user_id: str,
+        days: int = 7,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[AuditLog]:
+        """Stream user's recent activity in batches"""
+        stmt = self._user_activity_stmt(user_id, days, limit)
+        async for entry in self._stream(stmt):
+            yield entry
+    
+    def _user_activity_stmt(self, user_id: str, days: int, limit: Optional[int]):
+        """Build the recent activity query for a user"""
         cutoff = datetime.now(UTC) - timedelta(days=days)
         
         stmt = (
@@ -161,7 +178,7 @@ class AuditLogRepository(BaseRepository[AuditLog]):
                 )
             )
             .order_by(AuditLog.timestamp.desc())
-            .limit(limit)
         )
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
\ No newline at end of file
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
\ No newline at end of file
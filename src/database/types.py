@@ -4,6 +4,12 @@ Custom database types for cross-database compatibility
 
 import json
 from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
 from sqlalchemy import JSON, String, Text, TypeDecorator
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.mutable import MutableDict, MutableList
@@ -24,18 +30,17 @@ class JSONType(TypeDecorator):
             return dialect.type_descriptor(JSON)
 
     def process_bind_param(self, value, dialect):
-        if value is None:
-            return value
-        if isinstance(value, (dict, list)):
-            return value
-        return json.loads(value)
+        # The driver / JSON impl serializes Python values itself; only
+        # pre-encoded JSON text needs decoding first
+        if isinstance(value, (str, bytes, bytearray)):
+            return _json_loads(value)
+        return value
 
     def process_result_value(self, value, dialect):
-        if value is None:
-            return value
-        if isinstance(value, (dict, list)):
-            return value
-        return json.loads(value)
+        # JSONB and JSON results arrive already decoded
+        if isinstance(value, (str, bytes, bytearray)):
+            return _json_loads(value)
+        return value
 
 
 class ArrayType(TypeDecorator):
@@ -59,23 +64,15 @@ class ArrayType(TypeDecorator):
             return dialect.type_descriptor(JSON)
 
     def process_bind_param(self, value, dialect):
-        if value is None:
-            return value
-        if dialect.name == 'postgresql':
-            return value
-        # For non-PostgreSQL, convert list to JSON
-        if isinstance(value, list):
-            return value  # JSON type will handle serialization
+        # ARRAY and JSON impls both accept the list as-is
         return value
 
     def process_result_value(self, value, dialect):
-        if value is None:
-            return value
         if dialect.name == 'postgresql':
             return value
         # For non-PostgreSQL, value should already be a list from JSON
-        if isinstance(value, str):
-            return json.loads(value)
+        if isinstance(value, (str, bytes, bytearray)):
+            return _json_loads(value)
         return value
 
 
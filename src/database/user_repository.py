@@ -5,6 +5,7 @@ from sqlalchemy.orm import selectinload
 
 from .base_repository import BaseRepository
 from .models import User, Role
+from ..utils import get_password_hash_async, verify_and_update_password_async
 
 
 class UserRepository(BaseRepository[User]):
@@ -37,10 +38,7 @@ class UserRepository(BaseRepository[User]):
         **kwargs
     ) -> User:
         """Create user with hashed password"""
-        from passlib.context import CryptContext
-        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        
-        password_hash = pwd_context.hash(password)
+        password_hash = await get_password_hash_async(password)
         
         return await self.create(
             username=username,
@@ -50,14 +48,18 @@ class UserRepository(BaseRepository[User]):
         )
     
     async def verify_password(self, user: User, password: str) -> bool:
-        """Verify user password"""
-        from passlib.context import CryptContext
-        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        
+        """Verify user password, upgrading outdated hashes in place"""
         if not user.password_hash:
             return False
         
-        return pwd_context.verify(password, user.password_hash)
+        valid, new_hash = await verify_and_update_password_async(
+            password, user.password_hash
+        )
+        if valid and new_hash:
+            user.password_hash = new_hash
+            await self.session.flush()
+        
+        return valid
     
     async def add_role(self, user_id: str, role_id: str) -> bool:
         """Add role to user"""
@@ -1,25 +1,77 @@
 import asyncio
-from typing import Any, Dict, List, Optional, AsyncIterator
+from typing import Any, Dict, List, Optional, AsyncIterator, Tuple
 import anthropic
 from anthropic import AsyncAnthropic
 
 from .base import BaseLLMClient, LLMConfig, LLMResponse, ChatMessage, LLMProvider, LLMClientFactory
-from ..utils import retry_async
+from .http_pool import get_http_client
+from .pricing import pricing_table
+from .tokenizer import tiktoken, count_tokens
+
+
+def _to_anthropic_messages(
+    messages: List[ChatMessage]
+) -> Tuple[Optional[str], List[Dict[str, str]]]:
+    """Convert chat messages to Anthropic format, separating the system prompt"""
+    # The last system message wins, as Anthropic takes a single system prompt
+    system_message = next(
+        (msg.content for msg in reversed(messages) if msg.role == "system"), None
+    )
+    anthropic_messages = [
+        {"role": msg.role, "content": msg.content}
+        for msg in messages
+        if msg.role != "system"
+    ]
+    
+    # Ensure alternating user/assistant messages
+    if anthropic_messages and anthropic_messages[0]["role"] != "user":
+        anthropic_messages.insert(0, {"role": "user", "content": "Hello"})
+    
+    return system_message, anthropic_messages
+
+
+async def _text_deltas(stream) -> AsyncIterator[str]:
+    """Extract text deltas from a messages event stream"""
+    async for event in stream:
+        if event.type == "content_block_delta" and event.delta.type == "text_delta":
+            yield event.delta.text
+
+
+# Sampling parameters defaulted from LLMConfig
+_SAMPLING_PARAMS = frozenset(("top_p",))
+
+# Anthropic Claude pricing (as of 2024)
+_ANTHROPIC_PRICING = pricing_table({
+    "claude-3-opus": {"input": 0.015, "output": 0.075},
+    "claude-3-sonnet": {"input": 0.003, "output": 0.015},
+    "claude-3-haiku": {"input": 0.00025, "output": 0.00125},
+    "claude-2.1": {"input": 0.008, "output": 0.024},
+    "claude-2": {"input": 0.008, "output": 0.024},
+    "claude-instant": {"input": 0.00080, "output": 0.00240},
+})
 
 
 class AnthropicClient(BaseLLMClient):
     """Anthropic Claude API client implementation"""
     
+    retryable_errors = (
+        anthropic.RateLimitError,
+        anthropic.APITimeoutError,
+        anthropic.APIConnectionError,
+    )
+    
+    pricing = _ANTHROPIC_PRICING
+    
     def __init__(self, config: LLMConfig):
         super().__init__(config)
         self.client = AsyncAnthropic(
             api_key=config.api_key,
             base_url=config.base_url,
             timeout=config.timeout,
-            max_retries=config.retry_attempts,
+            max_retries=0,  # retries are handled by _call_with_retry
+            http_client=get_http_client(config.base_url, config.timeout),
         )
     
-    @retry_async(max_attempts=3, delay=1.0)
     async def generate(
         self,
         prompt: str,
@@ -44,7 +96,6 @@ class AnthropicClient(BaseLLMClient):
         async for chunk in self.chat_stream(messages, max_tokens, temperature, **kwargs):
             yield chunk
     
-    @retry_async(max_attempts=3, delay=1.0)
     async def chat(
         self,
         messages: List[ChatMessage],
@@ -53,39 +104,33 @@ class AnthropicClient(BaseLLMClient):
         **kwargs
     ) -> LLMResponse:
         """Generate response from chat messages"""
+        max_tokens = max_tokens or self.config.max_tokens
+        temperature = self.config.temperature if temperature is None else temperature
         try:
-            # Convert messages to Anthropic format
-            # Separate system message if present
-            system_message = None
-            anthropic_messages = []
-            
-            for msg in messages:
-                if msg.role == "system":
-                    system_message = msg.content
-                else:
-                    anthropic_messages.append({
-                        "role": msg.role,
-                        "content": msg.content
-                    })
-            
-            # Ensure alternating user/assistant messages
-            if anthropic_messages and anthropic_messages[0]["role"] != "user":
-                anthropic_messages.insert(0, {"role": "user", "content": "Hello"})
+            system_message, anthropic_messages = _to_anthropic_messages(messages)
             
-            response = await self.client.messages.create(
-                model=self.config.model,
-                messages=anthropic_messages,
-                max_tokens=max_tokens or self.config.max_tokens,
-                temperature=temperature or self.config.temperature,
-                system=system_message,
-                top_p=kwargs.get("top_p", self.config.top_p),
-                **{k: v for k, v in kwargs.items() if k not in ["top_p"]}
+            cache_key = self._cache_key(
+                "chat", [system_message, anthropic_messages], max_tokens, temperature, kwargs
             )
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return cached
+            
+            async with self._request_slot():
+                response = await self._call_with_retry(
+                    self.client.messages.create,
+                    model=self.config.model,
+                    messages=anthropic_messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    system=system_message,
+                    **self._sampling_params(kwargs, _SAMPLING_PARAMS)
+                )
             
             # Calculate total tokens (input + output)
             total_tokens = response.usage.input_tokens + response.usage.output_tokens
             
-            return LLMResponse(
+            result = LLMResponse(
                 text=response.content[0].text if response.content else "",
                 model=response.model,
                 tokens_used=total_tokens,
@@ -100,6 +145,8 @@ class AnthropicClient(BaseLLMClient):
                     "stop_sequence": response.stop_sequence,
                 }
             )
+            self.last_usage = result.metadata["usage"]
+            return self._cache_response(cache_key, result)
         except Exception as e:
             self.logger.error(f"Anthropic chat failed: {e}")
             raise
@@ -113,80 +160,39 @@ class AnthropicClient(BaseLLMClient):
     ) -> AsyncIterator[str]:
         """Generate chat response with streaming"""
         try:
-            # Convert messages to Anthropic format
-            system_message = None
-            anthropic_messages = []
-            
-            for msg in messages:
-                if msg.role == "system":
-                    system_message = msg.content
-                else:
-                    anthropic_messages.append({
-                        "role": msg.role,
-                        "content": msg.content
-                    })
+            system_message, anthropic_messages = _to_anthropic_messages(messages)
             
-            # Ensure alternating user/assistant messages
-            if anthropic_messages and anthropic_messages[0]["role"] != "user":
-                anthropic_messages.insert(0, {"role": "user", "content": "Hello"})
-            
-            async with self.client.messages.stream(
-                model=self.config.model,
-                messages=anthropic_messages,
-                max_tokens=max_tokens or self.config.max_tokens,
-                temperature=temperature or self.config.temperature,
-                system=system_message,
-                **kwargs
-            ) as stream:
-                async for text in stream.text_stream:
+            async with self._request_slot():
+                stream = await self._call_with_retry(
+                    self.client.messages.create,
+                    model=self.config.model,
+                    messages=anthropic_messages,
+                    max_tokens=max_tokens or self.config.max_tokens,
+                    temperature=self.config.temperature if temperature is None else temperature,
+                    system=system_message,
+                    stream=True,
+                    **kwargs
+                )
+                
+                async for text in self._coalesce(_text_deltas(stream)):
                     yield text
         except Exception as e:
             self.logger.error(f"Anthropic streaming failed: {e}")
             raise
     
-    async def count_tokens(self, text: str) -> int:
+    async def count_tokens(self, text: str, exact: bool = True) -> int:
         """Count tokens in text"""
-        try:
-            # Use Anthropic's token counting
-            # This is an approximation as Anthropic doesn't provide a direct API
-            # Claude uses a similar tokenization to GPT models
-            import tiktoken
-            
-            # Use cl100k_base encoding as approximation
-            encoding = tiktoken.get_encoding("cl100k_base")
-            tokens = encoding.encode(text)
-            return len(tokens)
-        except ImportError:
-            # Fallback to approximate count
-            self.logger.warning("tiktoken not installed, using approximate token count")
-            # Rough approximation: 1 token ≈ 4 characters
-            return len(text) // 4
+        if tiktoken is None:
+            return self._approximate_tokens(text)
+        # This is an approximation as Anthropic doesn't provide a direct API
+        # Claude uses a similar tokenization to GPT models, so the
+        # default cl100k_base encoding is used
+        return count_tokens(text, exact=exact)
     
     async def get_embedding(self, text: str) -> List[float]:
         """Get embedding for text"""
         # Anthropic doesn't provide embeddings API
         raise NotImplementedError("Anthropic does not provide embeddings API")
-    
-    def estimate_cost(self, tokens: int, is_input: bool = True) -> float:
-        """Estimate cost for token usage"""
-        # Anthropic Claude pricing (as of 2024)
-        pricing = {
-            "claude-3-opus": {"input": 0.015, "output": 0.075},
-            "claude-3-sonnet": {"input": 0.003, "output": 0.015},
-            "claude-3-haiku": {"input": 0.00025, "output": 0.00125},
-            "claude-2.1": {"input": 0.008, "output": 0.024},
-            "claude-2": {"input": 0.008, "output": 0.024},
-            "claude-instant": {"input": 0.00080, "output": 0.00240},
-        }
-        
-        # Find matching model
-        for model_key in pricing:
-            if model_key in self.config.model.lower():
-                price_type = "input" if is_input else "output"
-                return (tokens / 1000) * pricing[model_key][price_type]
-        
-        # Default pricing
-        return super().estimate_cost(tokens, is_input)
 
 
 # Register with factory
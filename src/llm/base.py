@@ -1,9 +1,19 @@
+import asyncio
+import copy
+import random
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, AsyncIterator, Union
-from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, AsyncIterator, Tuple, Union
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import logging
 
+from cachetools import LRUCache, TTLCache
+
+from .cache import response_cache_key
+from .pricing import DEFAULT_PRICING, PricingTable, match_prices
+from .rate_limit import TokenBucket
+from .tokenizer import tiktoken, count_message_tokens, estimate_tokens
 from ..utils import setup_logging
 
 
@@ -17,7 +27,7 @@ class LLMProvider(str, Enum):
     LOCAL = "local"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LLMConfig:
     """Configuration for LLM client"""
     provider: LLMProvider
@@ -31,6 +41,25 @@ class LLMConfig:
     presence_penalty: float = 0.0
     timeout: int = 30
     retry_attempts: int = 3
+    stream_chunk_size: int = 512  # characters buffered per streamed chunk (0 = off)
+    stream_flush_interval: float = 0.02  # seconds before a partial chunk is flushed
+    max_concurrent: int = 8  # in-flight requests per client
+    requests_per_minute: int = 0  # 0 = unlimited
+    response_cache_size: int = 1024  # cached deterministic responses (0 = off)
+    response_cache_ttl: int = 3600  # seconds
+    
+    def __post_init__(self):
+        if not self.api_key and self.provider != LLMProvider.LOCAL:
+            raise ValueError(f"API key required for {self.provider.value}")
+        
+        if self.max_tokens < 1:
+            raise ValueError("max_tokens must be positive")
+        
+        if not 0 <= self.temperature <= 2:
+            raise ValueError("temperature must be between 0 and 2")
+        
+        if self.max_concurrent < 1:
+            raise ValueError("max_concurrent must be positive")
 
 
 @dataclass
@@ -43,21 +72,118 @@ class LLMResponse:
     metadata: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ChatMessage:
     """Chat message for conversation"""
     role: str  # "system", "user", "assistant"
     content: str
     name: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[Dict[str, Any]] = field(default=None, hash=False, compare=False)
+
+
+def _copy_response(response: LLMResponse) -> LLMResponse:
+    """Copy of a response whose metadata can be changed without touching the original"""
+    return replace(response, metadata=copy.deepcopy(response.metadata))
 
 
 class BaseLLMClient(ABC):
     """Abstract base class for LLM clients"""
     
+    # Provider errors worth retrying (rate limits, timeouts, connection errors)
+    retryable_errors: Tuple[type, ...] = ()
+    
+    # Model prices used by estimate_cost, most specific key first
+    pricing: PricingTable = DEFAULT_PRICING
+    
     def __init__(self, config: LLMConfig):
         self.config = config
         self.logger = setup_logging(f"LLM.{config.provider.value}")
+        self._model_lower = config.model.lower()
+        self._semaphore = asyncio.Semaphore(config.max_concurrent)
+        self._bucket = TokenBucket(config.requests_per_minute)
+        self._warned_approximate = False
+        self.last_usage: Optional[Dict[str, Any]] = None  # usage from the last API response
+        self._response_cache: Optional[TTLCache] = (
+            TTLCache(maxsize=config.response_cache_size, ttl=config.response_cache_ttl)
+            if config.response_cache_size > 0
+            else None
+        )
+    
+    @asynccontextmanager
+    async def _request_slot(self):
+        """Hold a concurrency slot and a rate-limit token for one API request"""
+        async with self._semaphore:
+            await self._bucket.acquire()
+            yield
+    
+    def _sampling_params(self, kwargs: Dict[str, Any], names: FrozenSet[str]) -> Dict[str, Any]:
+        """Default the named sampling parameters from config and pass other kwargs through"""
+        params = {name: getattr(self.config, name) for name in names}
+        params.update(kwargs)
+        return params
+    
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """Seconds to wait before retrying, preferring the server's Retry-After"""
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return min(60.0, 0.5 * 2 ** attempt) + random.random() * 0.25
+    
+    async def _call_with_retry(self, call: Callable[..., Awaitable[Any]], **kwargs) -> Any:
+        """Call a provider API method, retrying only on retryable errors"""
+        attempt = 0
+        while True:
+            try:
+                return await call(**kwargs)
+            except self.retryable_errors as e:
+                if attempt >= self.config.retry_attempts:
+                    raise
+                delay = self._retry_delay(e, attempt)
+                self.logger.warning(
+                    f"{type(e).__name__}, retrying in {delay:.2f}s "
+                    f"(attempt {attempt + 1}/{self.config.retry_attempts})"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+    
+    def _cache_key(
+        self,
+        kind: str,
+        payload: Any,
+        max_tokens: int,
+        temperature: float,
+        kwargs: Dict[str, Any],
+    ) -> Optional[str]:
+        """Cache key for a deterministic request, or None if it must not be cached"""
+        if self._response_cache is None:
+            return None
+        if temperature > 0 and kwargs.get("seed") is None:
+            return None
+        return response_cache_key(
+            kind=kind,
+            model=self.config.model,
+            payload=payload,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            params=kwargs,
+        )
+    
+    def _cached_response(self, key: Optional[str]) -> Optional[LLMResponse]:
+        """Look up a cached response, returning a copy the caller may modify"""
+        if key is None:
+            return None
+        response = self._response_cache.get(key)
+        return _copy_response(response) if response is not None else None
+    
+    def _cache_response(self, key: Optional[str], response: LLMResponse) -> LLMResponse:
+        """Store a copy of a response under key (if cacheable) and return it"""
+        if key is not None:
+            self._response_cache[key] = _copy_response(response)
+        return response
     
     @abstractmethod
     async def generate(
@@ -104,8 +230,8 @@ class BaseLLMClient(ABC):
         pass
     
     @abstractmethod
-    async def count_tokens(self, text: str) -> int:
-        """Count tokens in text"""
+    async def count_tokens(self, text: str, exact: bool = True) -> int:
+        """Count tokens in text (exact=False allows a fast estimate for short texts)"""
         pass
     
     @abstractmethod
@@ -113,43 +239,63 @@ class BaseLLMClient(ABC):
         """Get embedding for text (if supported)"""
         pass
     
-    def estimate_cost(self, tokens: int, is_input: bool = True) -> float:
-        """Estimate cost for token usage"""
-        # Default implementation - override in subclasses
-        # Prices in USD per 1K tokens (approximate)
-        price_per_1k = {
-            "gpt-4": {"input": 0.03, "output": 0.06},
-            "gpt-4-turbo": {"input": 0.01, "output": 0.03},
-            "gpt-3.5-turbo": {"input": 0.0005, "output": 0.0015},
-            "claude-3-opus": {"input": 0.015, "output": 0.075},
-            "claude-3-sonnet": {"input": 0.003, "output": 0.015},
-            "claude-3-haiku": {"input": 0.00025, "output": 0.00125},
-        }
-        
-        # Find matching model pricing
-        for model_prefix, prices in price_per_1k.items():
-            if model_prefix in self.config.model.lower():
-                price_type = "input" if is_input else "output"
-                return (tokens / 1000) * prices[price_type]
-        
-        # Default pricing if model not found
-        return (tokens / 1000) * (0.001 if is_input else 0.002)
-    
-    def validate_config(self) -> bool:
-        """Validate client configuration"""
-        if not self.config.api_key and self.config.provider != LLMProvider.LOCAL:
-            self.logger.error(f"API key required for {self.config.provider.value}")
-            return False
+    async def get_embeddings(self, texts: List[str], batch_size: int = 512) -> List[List[float]]:
+        """Get embeddings for many texts (override for providers with batch APIs)"""
+        return list(await asyncio.gather(*(self.get_embedding(text) for text in texts)))
+    
+    async def _coalesce(self, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Merge small streamed deltas, flushing on size or elapsed time"""
+        max_size = self.config.stream_chunk_size
+        if max_size <= 0:
+            async for chunk in chunks:
+                yield chunk
+            return
         
-        if self.config.max_tokens < 1:
-            self.logger.error("max_tokens must be positive")
-            return False
+        interval = self.config.stream_flush_interval
+        loop = asyncio.get_running_loop()
+        parts: List[str] = []
+        size = 0
+        last_flush = loop.time()
         
-        if not 0 <= self.config.temperature <= 2:
-            self.logger.error("temperature must be between 0 and 2")
-            return False
+        async for chunk in chunks:
+            parts.append(chunk)
+            size += len(chunk)
+            now = loop.time()
+            if size >= max_size or now - last_flush >= interval:
+                yield "".join(parts)
+                parts.clear()
+                size = 0
+                last_flush = now
         
-        return True
+        if parts:
+            yield "".join(parts)
+    
+    @property
+    def tokenizer_model(self) -> Optional[str]:
+        """Model name used to pick the tiktoken encoding (None for cl100k_base)"""
+        return None
+    
+    def _approximate_tokens(self, text: str) -> int:
+        """Rough token count used when tiktoken is not installed"""
+        if not self._warned_approximate:
+            self.logger.warning("tiktoken not installed, using approximate token count")
+            self._warned_approximate = True
+        # Count UTF-8 bytes rather than characters so CJK/emoji aren't undercounted
+        return estimate_tokens(text)
+    
+    async def count_message_tokens(self, messages: List[ChatMessage]) -> int:
+        """Count tokens for chat messages including per-message overhead"""
+        if tiktoken is None:
+            total = 0
+            for msg in messages:
+                total += await self.count_tokens(msg.content)
+            return total
+        return count_message_tokens(messages, self.tokenizer_model)
+    
+    def estimate_cost(self, tokens: int, is_input: bool = True) -> float:
+        """Estimate cost for token usage"""
+        input_price, output_price = match_prices(self._model_lower, self.pricing)
+        return (tokens / 1000) * (input_price if is_input else output_price)
 
 
 class LLMClientFactory:
@@ -157,90 +303,42 @@ class LLMClientFactory:
     
     _clients: Dict[str, type] = {}
     
+    # Clients hold loop-bound semaphores and HTTP pools, so they are reused
+    # only within the event loop that created them
+    _instances: Dict[asyncio.AbstractEventLoop, LRUCache] = {}
+    _cache_size = 64
+    
     @classmethod
     def register(cls, provider: LLMProvider, client_class: type):
         """Register a client class for a provider"""
         cls._clients[provider.value] = client_class
+        cls._instances.clear()
     
     @classmethod
     def create(cls, config: LLMConfig) -> BaseLLMClient:
-        """Create an LLM client from config"""
+        """Create an LLM client from config, reusing the loop's client for an equal config"""
         client_class = cls._clients.get(config.provider.value)
         
         if not client_class:
             raise ValueError(f"Unknown provider: {config.provider.value}")
         
-        client = client_class(config)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop to scope the client to, so it is not shared
+            return client_class(config)
         
-        if not client.validate_config():
-            raise ValueError(f"Invalid configuration for {config.provider.value}")
+        # Drop clients left behind by loops that have since been closed
+        for stale in [other for other in cls._instances if other.is_closed()]:
+            del cls._instances[stale]
         
+        clients = cls._instances.setdefault(loop, LRUCache(maxsize=cls._cache_size))
+        client = clients.get(config)
+        if client is None:
+            client = clients[config] = client_class(config)
         return client
     
     @classmethod
     def list_providers(cls) -> List[str]:
         """List registered providers"""
         return list(cls._clients.keys())
-
-
-class LLMManager:
-    """Manager for multiple LLM clients"""
-    
-    def __init__(self):
-        self.clients: Dict[str, BaseLLMClient] = {}
-        self.default_client: Optional[str] = None
-        self.logger = setup_logging("LLMManager")
-    
-    def add_client(self, name: str, client: BaseLLMClient, is_default: bool = False):
-        """Add an LLM client"""
-        self.clients[name] = client
-        if is_default or self.default_client is None:
-            self.default_client = name
-        self.logger.info(f"Added LLM client: {name}")
-    
-    def get_client(self, name: Optional[str] = None) -> BaseLLMClient:
-        """Get an LLM client by name or default"""
-        name = name or self.default_client
-        
-        if not name:
-            raise ValueError("No client name provided and no default set")
-        
-        client = self.clients.get(name)
-        if not client:
-            raise ValueError(f"Client '{name}' not found")
-        
-        return client
-    
-    async def generate(
-        self,
-        prompt: str,
-        client_name: Optional[str] = None,
-        **kwargs
-    ) -> LLMResponse:
-        """Generate text using specified or default client"""
-        client = self.get_client(client_name)
-        return await client.generate(prompt, **kwargs)
-    
-    async def chat(
-        self,
-        messages: List[ChatMessage],
-        client_name: Optional[str] = None,
-        **kwargs
-    ) -> LLMResponse:
-        """Chat using specified or default client"""
-        client = self.get_client(client_name)
-        return await client.chat(messages, **kwargs)
-    
-    def list_clients(self) -> List[str]:
-        """List available clients"""
-        return list(self.clients.keys())
-    
-    def get_client_info(self, name: Optional[str] = None) -> Dict[str, Any]:
-        """Get information about a client"""
-        client = self.get_client(name)
-        return {
-            "provider": client.config.provider.value,
-            "model": client.config.model,
-            "max_tokens": client.config.max_tokens,
-            "temperature": client.config.temperature,
-        }
\ No newline at end of file
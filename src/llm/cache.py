@@ -0,0 +1,25 @@
+"""
+Response caching helpers for deterministic LLM calls
+"""
+
+import json
+from hashlib import blake2b
+from typing import Any
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(
+            obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str
+        )
+except ImportError:  # pragma: no cover
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(
+            obj, sort_keys=True, separators=(",", ":"), default=str
+        ).encode()
+
+
+def response_cache_key(**parts: Any) -> str:
+    """Build a stable cache key from request parameters"""
+    return blake2b(_dumps(parts), digest_size=16).hexdigest()
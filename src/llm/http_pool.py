@@ -0,0 +1,63 @@
+"""
+Shared HTTP connection pools for LLM provider SDKs
+"""
+
+import asyncio
+from importlib.util import find_spec
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+
+# HTTP/2 multiplexing needs the optional h2 package
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Pooled connections belong to the event loop that opened them, so each loop
+# gets its own pool
+_HTTP_POOLS: Dict[
+    asyncio.AbstractEventLoop, Dict[Tuple[Optional[str], float], httpx.AsyncClient]
+] = {}
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_http_client(base_url: Optional[str], timeout: float) -> Optional[httpx.AsyncClient]:
+    """Get the running loop's shared HTTP client for a base URL and timeout
+
+    Returns None outside an event loop, leaving the SDK to create (and own)
+    its own client.
+    """
+    loop = _running_loop()
+    if loop is None:
+        return None
+
+    # Drop pools left behind by loops that have since been closed
+    for stale in [other for other in _HTTP_POOLS if other.is_closed()]:
+        del _HTTP_POOLS[stale]
+
+    pool = _HTTP_POOLS.setdefault(loop, {})
+    key = (base_url, timeout)
+    client = pool.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=POOL_LIMITS,
+            http2=HTTP2_AVAILABLE,
+            timeout=timeout,
+            follow_redirects=True,
+        )
+        pool[key] = client
+    return client
+
+
+async def close_http_clients():
+    """Close the running loop's shared HTTP clients (call at app shutdown)"""
+    pool = _HTTP_POOLS.pop(_running_loop(), {})
+    for client in pool.values():
+        await client.aclose()
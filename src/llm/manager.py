@@ -0,0 +1,87 @@
+"""
+Manager for multiple LLM clients
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Union
+
+from .base import BaseLLMClient, ChatMessage, LLMResponse
+from ..utils import setup_logging
+
+
+class LLMManager:
+    """Manager for multiple LLM clients"""
+    
+    def __init__(self):
+        self.clients: Dict[str, BaseLLMClient] = {}
+        self.default_client: Optional[str] = None
+        self.logger = setup_logging("LLMManager")
+    
+    def add_client(self, name: str, client: BaseLLMClient, is_default: bool = False):
+        """Add an LLM client"""
+        self.clients[name] = client
+        if is_default or self.default_client is None:
+            self.default_client = name
+        self.logger.info(f"Added LLM client: {name}")
+    
+    def get_client(self, name: Optional[str] = None) -> BaseLLMClient:
+        """Get an LLM client by name or default"""
+        name = name or self.default_client
+        
+        if not name:
+            raise ValueError("No client name provided and no default set")
+        
+        client = self.clients.get(name)
+        if not client:
+            raise ValueError(f"Client '{name}' not found")
+        
+        return client
+    
+    async def generate(
+        self,
+        prompt: str,
+        client_name: Optional[str] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Generate text using specified or default client"""
+        client = self.get_client(client_name)
+        return await client.generate(prompt, **kwargs)
+    
+    async def chat(
+        self,
+        messages: List[ChatMessage],
+        client_name: Optional[str] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Chat using specified or default client"""
+        client = self.get_client(client_name)
+        return await client.chat(messages, **kwargs)
+    
+    async def chat_all(
+        self,
+        messages: List[ChatMessage],
+        client_names: Optional[List[str]] = None,
+        **kwargs
+    ) -> Dict[str, Union[LLMResponse, Exception]]:
+        """Chat with several clients concurrently, returning each result or error"""
+        names = client_names or self.list_clients()
+        clients = [self.get_client(name) for name in names]
+        results = await asyncio.gather(
+            *(client.chat(messages, **kwargs) for client in clients),
+            return_exceptions=True,
+        )
+        return dict(zip(names, results))
+    
+    def list_clients(self) -> List[str]:
+        """List available clients"""
+        return list(self.clients.keys())
+    
+    def get_client_info(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """Get information about a client"""
+        client = self.get_client(name)
+        return {
+            "provider": client.config.provider.value,
+            "model": client.config.model,
+            "max_tokens": client.config.max_tokens,
+            "temperature": client.config.temperature,
+        }
\ No newline at end of file
@@ -4,22 +4,75 @@ import openai
 from openai import AsyncOpenAI
 
 from .base import BaseLLMClient, LLMConfig, LLMResponse, ChatMessage, LLMProvider, LLMClientFactory
-from ..utils import retry_async
+from .http_pool import get_http_client
+from .pricing import pricing_table
+from .tokenizer import tiktoken, count_tokens
+
+
+def _to_openai_messages(messages: List[ChatMessage]) -> List[Dict[str, str]]:
+    """Convert chat messages to OpenAI format"""
+    return [{"role": msg.role, "content": msg.content} for msg in messages]
+
+
+async def _completion_text(stream) -> AsyncIterator[str]:
+    """Extract text deltas from a completions stream"""
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].text:
+            yield chunk.choices[0].text
+
+
+async def _chat_delta_text(stream) -> AsyncIterator[str]:
+    """Extract content deltas from a chat completions stream"""
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def _usage_dict(usage) -> Dict[str, int]:
+    """Copy token usage into a plain dict without a pydantic model_dump"""
+    if usage is None:
+        return {}
+    return {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens,
+    }
+
+
+# Default embedding model and the API's per-request input limit
+_EMBEDDING_MODEL = "text-embedding-ada-002"
+_MAX_EMBEDDING_BATCH = 2048
+
+# Sampling parameters defaulted from LLMConfig
+_SAMPLING_PARAMS = frozenset(("top_p", "frequency_penalty", "presence_penalty"))
+
+# OpenAI pricing (as of 2024)
+_OPENAI_PRICING = pricing_table({
+    "gpt-4-turbo": {"input": 0.01, "output": 0.03},
+    "gpt-4": {"input": 0.03, "output": 0.06},
+    "gpt-4-32k": {"input": 0.06, "output": 0.12},
+    "gpt-3.5-turbo": {"input": 0.0005, "output": 0.0015},
+    "gpt-3.5-turbo-16k": {"input": 0.001, "output": 0.002},
+})
 
 
 class OpenAIClient(BaseLLMClient):
     """OpenAI API client implementation"""
     
+    retryable_errors = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError)
+    
+    pricing = _OPENAI_PRICING
+    
     def __init__(self, config: LLMConfig):
         super().__init__(config)
         self.client = AsyncOpenAI(
             api_key=config.api_key,
             base_url=config.base_url,
             timeout=config.timeout,
-            max_retries=config.retry_attempts,
+            max_retries=0,  # retries are handled by _call_with_retry
+            http_client=get_http_client(config.base_url, config.timeout),
         )
     
-    @retry_async(max_attempts=3, delay=1.0)
     async def generate(
         self,
         prompt: str,
@@ -28,21 +81,27 @@ class OpenAIClient(BaseLLMClient):
         **kwargs
     ) -> LLMResponse:
         """Generate text from a prompt"""
+        max_tokens = max_tokens or self.config.max_tokens
+        temperature = self.config.temperature if temperature is None else temperature
         try:
-            response = await self.client.completions.create(
-                model=self.config.model,
-                prompt=prompt,
-                max_tokens=max_tokens or self.config.max_tokens,
-                temperature=temperature or self.config.temperature,
-                top_p=kwargs.get("top_p", self.config.top_p),
-                frequency_penalty=kwargs.get("frequency_penalty", self.config.frequency_penalty),
-                presence_penalty=kwargs.get("presence_penalty", self.config.presence_penalty),
-                **{k: v for k, v in kwargs.items() if k not in ["top_p", "frequency_penalty", "presence_penalty"]}
-            )
+            cache_key = self._cache_key("generate", prompt, max_tokens, temperature, kwargs)
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return cached
+            
+            async with self._request_slot():
+                response = await self._call_with_retry(
+                    self.client.completions.create,
+                    model=self.config.model,
+                    prompt=prompt,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    **self._sampling_params(kwargs, _SAMPLING_PARAMS)
+                )
             
             choice = response.choices[0]
             
-            return LLMResponse(
+            result = LLMResponse(
                 text=choice.text,
                 model=response.model,
                 tokens_used=response.usage.total_tokens if response.usage else 0,
@@ -50,9 +109,11 @@ class OpenAIClient(BaseLLMClient):
                 metadata={
                     "id": response.id,
                     "created": response.created,
-                    "usage": response.usage.model_dump() if response.usage else {},
+                    "usage": _usage_dict(response.usage),
                 }
             )
+            self.last_usage = result.metadata["usage"]
+            return self._cache_response(cache_key, result)
         except Exception as e:
             self.logger.error(f"OpenAI generation failed: {e}")
             raise
@@ -66,23 +127,23 @@ class OpenAIClient(BaseLLMClient):
     ) -> AsyncIterator[str]:
         """Generate text with streaming"""
         try:
-            stream = await self.client.completions.create(
-                model=self.config.model,
-                prompt=prompt,
-                max_tokens=max_tokens or self.config.max_tokens,
-                temperature=temperature or self.config.temperature,
-                stream=True,
-                **kwargs
-            )
+            async with self._request_slot():
+                stream = await self._call_with_retry(
+                    self.client.completions.create,
+                    model=self.config.model,
+                    prompt=prompt,
+                    max_tokens=max_tokens or self.config.max_tokens,
+                    temperature=self.config.temperature if temperature is None else temperature,
+                    stream=True,
+                    **kwargs
+                )
             
-            async for chunk in stream:
-                if chunk.choices and chunk.choices[0].text:
-                    yield chunk.choices[0].text
+                async for text in self._coalesce(_completion_text(stream)):
+                    yield text
         except Exception as e:
             self.logger.error(f"OpenAI streaming failed: {e}")
             raise
     
-    @retry_async(max_attempts=3, delay=1.0)
     async def chat(
         self,
         messages: List[ChatMessage],
@@ -91,27 +152,29 @@ class OpenAIClient(BaseLLMClient):
         **kwargs
     ) -> LLMResponse:
         """Generate response from chat messages"""
+        max_tokens = max_tokens or self.config.max_tokens
+        temperature = self.config.temperature if temperature is None else temperature
         try:
-            # Convert messages to OpenAI format
-            openai_messages = [
-                {"role": msg.role, "content": msg.content}
-                for msg in messages
-            ]
+            openai_messages = _to_openai_messages(messages)
             
-            response = await self.client.chat.completions.create(
-                model=self.config.model,
-                messages=openai_messages,
-                max_tokens=max_tokens or self.config.max_tokens,
-                temperature=temperature or self.config.temperature,
-                top_p=kwargs.get("top_p", self.config.top_p),
-                frequency_penalty=kwargs.get("frequency_penalty", self.config.frequency_penalty),
-                presence_penalty=kwargs.get("presence_penalty", self.config.presence_penalty),
-                **{k: v for k, v in kwargs.items() if k not in ["top_p", "frequency_penalty", "presence_penalty"]}
-            )
+            cache_key = self._cache_key("chat", openai_messages, max_tokens, temperature, kwargs)
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return cached
+            
+            async with self._request_slot():
+                response = await self._call_with_retry(
+                    self.client.chat.completions.create,
+                    model=self.config.model,
+                    messages=openai_messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    **self._sampling_params(kwargs, _SAMPLING_PARAMS)
+                )
             
             choice = response.choices[0]
             
-            return LLMResponse(
+            result = LLMResponse(
                 text=choice.message.content or "",
                 model=response.model,
                 tokens_used=response.usage.total_tokens if response.usage else 0,
@@ -119,10 +182,12 @@ class OpenAIClient(BaseLLMClient):
                 metadata={
                     "id": response.id,
                     "created": response.created,
-                    "usage": response.usage.model_dump() if response.usage else {},
+                    "usage": _usage_dict(response.usage),
                     "role": choice.message.role,
                 }
             )
+            self.last_usage = result.metadata["usage"]
+            return self._cache_response(cache_key, result)
         except Exception as e:
             self.logger.error(f"OpenAI chat failed: {e}")
             raise
@@ -136,80 +201,76 @@ class OpenAIClient(BaseLLMClient):
     ) -> AsyncIterator[str]:
         """Generate chat response with streaming"""
         try:
-            # Convert messages to OpenAI format
-            openai_messages = [
-                {"role": msg.role, "content": msg.content}
-                for msg in messages
-            ]
+            openai_messages = _to_openai_messages(messages)
             
-            stream = await self.client.chat.completions.create(
-                model=self.config.model,
-                messages=openai_messages,
-                max_tokens=max_tokens or self.config.max_tokens,
-                temperature=temperature or self.config.temperature,
-                stream=True,
-                **kwargs
-            )
+            async with self._request_slot():
+                stream = await self._call_with_retry(
+                    self.client.chat.completions.create,
+                    model=self.config.model,
+                    messages=openai_messages,
+                    max_tokens=max_tokens or self.config.max_tokens,
+                    temperature=self.config.temperature if temperature is None else temperature,
+                    stream=True,
+                    **kwargs
+                )
             
-            async for chunk in stream:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+                async for text in self._coalesce(_chat_delta_text(stream)):
+                    yield text
         except Exception as e:
             self.logger.error(f"OpenAI chat streaming failed: {e}")
             raise
     
-    async def count_tokens(self, text: str) -> int:
+    @property
+    def tokenizer_model(self) -> Optional[str]:
+        """OpenAI models map directly to tiktoken encodings"""
+        return self.config.model
+    
+    async def count_tokens(self, text: str, exact: bool = True) -> int:
         """Count tokens in text using tiktoken"""
-        try:
-            import tiktoken
-            
-            # Get encoding for model
-            try:
-                encoding = tiktoken.encoding_for_model(self.config.model)
-            except KeyError:
-                # Fallback to cl100k_base encoding
-                encoding = tiktoken.get_encoding("cl100k_base")
-            
-            tokens = encoding.encode(text)
-            return len(tokens)
-        except ImportError:
-            # Fallback to approximate count
-            self.logger.warning("tiktoken not installed, using approximate token count")
-            # Rough approximation: 1 token ≈ 4 characters
-            return len(text) // 4
+        if tiktoken is None:
+            return self._approximate_tokens(text)
+        # Encodings and counts for repeated texts are cached
+        return count_tokens(text, self.tokenizer_model, exact=exact)
     
     async def get_embedding(self, text: str) -> List[float]:
         """Get embedding for text"""
         try:
-            response = await self.client.embeddings.create(
-                model="text-embedding-ada-002",  # Default embedding model
-                input=text
-            )
+            async with self._request_slot():
+                response = await self._call_with_retry(
+                    self.client.embeddings.create,
+                    model=_EMBEDDING_MODEL,
+                    input=text
+                )
             
             return response.data[0].embedding
         except Exception as e:
             self.logger.error(f"OpenAI embedding failed: {e}")
             raise
     
-    def estimate_cost(self, tokens: int, is_input: bool = True) -> float:
-        """Estimate cost for token usage"""
-        # OpenAI pricing (as of 2024)
-        pricing = {
-            "gpt-4-turbo": {"input": 0.01, "output": 0.03},
-            "gpt-4": {"input": 0.03, "output": 0.06},
-            "gpt-4-32k": {"input": 0.06, "output": 0.12},
-            "gpt-3.5-turbo": {"input": 0.0005, "output": 0.0015},
-            "gpt-3.5-turbo-16k": {"input": 0.001, "output": 0.002},
-        }
-        
-        # Find matching model
-        for model_key in pricing:
-            if model_key in self.config.model.lower():
-                price_type = "input" if is_input else "output"
-                return (tokens / 1000) * pricing[model_key][price_type]
+    async def get_embeddings(self, texts: List[str], batch_size: int = 512) -> List[List[float]]:
+        """Get embeddings for many texts, sending them in concurrent batches"""
+        batch_size = max(1, min(batch_size, _MAX_EMBEDDING_BATCH))
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        try:
+            responses = await asyncio.gather(*(self._embed_batch(batch) for batch in batches))
+        except Exception as e:
+            self.logger.error(f"OpenAI batch embedding failed: {e}")
+            raise
         
-        # Default pricing
-        return super().estimate_cost(tokens, is_input)
+        return [
+            item.embedding
+            for response in responses
+            for item in sorted(response.data, key=lambda item: item.index)
+        ]
+    
+    async def _embed_batch(self, texts: List[str]):
+        """Embed one batch of texts in a single API call"""
+        async with self._request_slot():
+            return await self._call_with_retry(
+                self.client.embeddings.create,
+                model=_EMBEDDING_MODEL,
+                input=texts
+            )
 
 
 # Register with factory
@@ -0,0 +1,44 @@
+"""
+Model pricing tables for LLM cost estimates
+"""
+
+from functools import lru_cache
+from typing import Dict, Tuple
+
+
+# (model key, input price, output price) in USD per 1K tokens
+PricingTable = Tuple[Tuple[str, float, float], ...]
+
+# Used when a model matches no pricing entry
+FALLBACK_PRICES = (0.001, 0.002)
+
+
+def pricing_table(pricing: Dict[str, Dict[str, float]]) -> PricingTable:
+    """Build a pricing table ordered so the longest (most specific) key matches first"""
+    return tuple(
+        sorted(
+            ((key, prices["input"], prices["output"]) for key, prices in pricing.items()),
+            key=lambda entry: -len(entry[0]),
+        )
+    )
+
+
+# Prices in USD per 1K tokens (approximate)
+DEFAULT_PRICING = pricing_table({
+    "gpt-4": {"input": 0.03, "output": 0.06},
+    "gpt-4-turbo": {"input": 0.01, "output": 0.03},
+    "gpt-3.5-turbo": {"input": 0.0005, "output": 0.0015},
+    "claude-3-opus": {"input": 0.015, "output": 0.075},
+    "claude-3-sonnet": {"input": 0.003, "output": 0.015},
+    "claude-3-haiku": {"input": 0.00025, "output": 0.00125},
+})
+
+
+@lru_cache(maxsize=256)
+def match_prices(model: str, table: PricingTable = DEFAULT_PRICING) -> Tuple[float, float]:
+    """Find (input, output) prices for a lowercased model name"""
+    for entries in (table, DEFAULT_PRICING):
+        for key, input_price, output_price in entries:
+            if key in model:
+                return input_price, output_price
+    return FALLBACK_PRICES
@@ -0,0 +1,103 @@
+"""
+Multi-step prompt chains
+"""
+
+from collections import ChainMap
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .prompts import PromptLibrary, PromptType, logger
+
+
+@dataclass(frozen=True)
+class CompiledStep:
+    """A chain step with its variable references resolved at add time"""
+    template: str
+    output_key: str
+    static_vars: Dict[str, Any]
+    # (variable, context key) pairs for "$name" references
+    dynamic_vars: Tuple[Tuple[str, str], ...]
+
+
+class PromptChain:
+    """Chain multiple prompts together"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.steps: List[CompiledStep] = []
+        self.context: Dict[str, Any] = {}
+    
+    def add_step(
+        self,
+        template_name: str,
+        variables: Dict[str, Any],
+        output_key: str,
+    ) -> "PromptChain":
+        """Add a step to the chain"""
+        static_vars = {}
+        dynamic_vars = []
+        for key, value in variables.items():
+            if isinstance(value, str) and value.startswith("$"):
+                # Reference to context variable
+                dynamic_vars.append((key, value[1:]))
+            else:
+                static_vars[key] = value
+        
+        self.steps.append(CompiledStep(
+            template=template_name,
+            output_key=output_key,
+            static_vars=static_vars,
+            dynamic_vars=tuple(dynamic_vars),
+        ))
+        return self
+    
+    async def execute(
+        self,
+        library: PromptLibrary,
+        llm_client,
+        initial_context: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Execute the prompt chain"""
+        from .base import ChatMessage
+        
+        # Initialize context
+        self.context = initial_context or {}
+        results = {}
+        scope = ChainMap(self.context, results)
+        
+        for i, step in enumerate(self.steps):
+            # Get template
+            template_name = step.template
+            template = library.get_template(template_name)
+            if not template:
+                raise ValueError(f"Template '{template_name}' not found")
+            
+            # Prepare variables
+            variables = dict(step.static_vars)
+            for key, var_name in step.dynamic_vars:
+                try:
+                    variables[key] = scope[var_name]
+                except KeyError:
+                    raise ValueError(f"Variable '{var_name}' not found in context") from None
+            
+            # Format prompt
+            prompt = template.format(**variables)
+            
+            # Execute with LLM
+            logger.info(f"Executing chain step {i+1}: {template_name}")
+            
+            if template.type == PromptType.SYSTEM:
+                messages = [
+                    ChatMessage(role="system", content=prompt),
+                    ChatMessage(role="user", content="Please proceed."),
+                ]
+                response = await llm_client.chat(messages)
+            else:
+                response = await llm_client.generate(prompt)
+            
+            # Store result
+            output_key = step.output_key
+            results[output_key] = response.text
+            self.context[output_key] = response.text
+        
+        return results
@@ -0,0 +1,70 @@
+"""
+Model-specific prompt optimization
+"""
+
+from functools import lru_cache
+
+
+class PromptOptimizer:
+    """Optimize prompts for better performance"""
+    
+    @staticmethod
+    def optimize_for_model(prompt: str, model: str) -> str:
+        """Optimize prompt for specific model"""
+        # Results are memoized per (prompt, model family)
+        return _optimize(prompt, _model_family(model))
+    
+    @staticmethod
+    def _add_gpt_instructions(prompt: str) -> str:
+        """Add GPT-specific instructions"""
+        # GPT models respond well to clear structure
+        if "step by step" not in prompt.lower():
+            prompt += "\n\nPlease think step by step."
+        return prompt
+    
+    @staticmethod
+    def _add_claude_instructions(prompt: str) -> str:
+        """Add Claude-specific instructions"""
+        # Claude models respond well to politeness and clarity
+        if not prompt.startswith("Please"):
+            prompt = "Please " + prompt[0].lower() + prompt[1:]
+        return prompt
+    
+    @staticmethod
+    def add_output_format(prompt: str, format_type: str) -> str:
+        """Add output format instructions"""
+        format_instructions = {
+            "json": "\n\nPlease format your response as valid JSON.",
+            "markdown": "\n\nPlease format your response using Markdown.",
+            "bullet": "\n\nPlease format your response as bullet points.",
+            "numbered": "\n\nPlease format your response as a numbered list.",
+        }
+        
+        instruction = format_instructions.get(format_type, "")
+        if instruction and instruction not in prompt:
+            prompt += instruction
+        
+        return prompt
+
+
+@lru_cache(maxsize=256)
+def _model_family(model: str) -> str:
+    """Reduce a model name to the family used for prompt optimizations"""
+    model = model.lower()
+    if "gpt" in model:
+        return "gpt"
+    if "claude" in model:
+        return "claude"
+    return ""
+
+
+@lru_cache(maxsize=1024)
+def _optimize(prompt: str, model_family: str) -> str:
+    """Apply model-family-specific optimizations to a prompt"""
+    if model_family == "gpt":
+        # OpenAI GPT optimizations
+        return PromptOptimizer._add_gpt_instructions(prompt)
+    if model_family == "claude":
+        # Anthropic Claude optimizations
+        return PromptOptimizer._add_claude_instructions(prompt)
+    return prompt
@@ -1,10 +1,12 @@
 import json
-import yaml
-from typing import Any, Dict, List, Optional
+import os
+import tempfile
+from typing import Any, Dict, IO, List, Optional, Tuple
 from pathlib import Path
 from string import Template
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from enum import Enum
 
 from ..utils import setup_logging
@@ -12,6 +14,66 @@ from ..utils import setup_logging
 
 logger = setup_logging("LLM.Prompts")
 
+YAML_SUFFIXES = (".yaml", ".yml")
+
+# Matches $variable or ${variable} placeholders
+_VAR_RE = re.compile(r'\$\{?(\w+)\}?')
+
+
+def _json_cache_path(file_path: Path) -> Path:
+    """Path of the JSON sidecar cache for a YAML template file"""
+    return file_path.with_name(file_path.name + ".json")
+
+
+@lru_cache(maxsize=None)
+def _yaml_support():
+    """Import PyYAML on first use, preferring the libyaml-backed loader/dumper"""
+    import yaml
+    try:
+        from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+    except ImportError:  # pragma: no cover
+        from yaml import SafeDumper, SafeLoader
+    return yaml, SafeLoader, SafeDumper
+
+
+def _load_yaml(stream: IO[str]) -> Any:
+    """Parse YAML with the safe loader"""
+    yaml, loader, _ = _yaml_support()
+    return yaml.load(stream, Loader=loader)
+
+
+def _dump_yaml(data: Any, stream: IO[str]) -> None:
+    """Write YAML with the safe dumper"""
+    yaml, _, dumper = _yaml_support()
+    yaml.dump(data, stream, Dumper=dumper, default_flow_style=False)
+
+
+def _write_json_cache(cache_path: Path, data: Dict[str, Any]) -> None:
+    """Write template data as compact JSON, replacing the sidecar atomically
+    
+    Raises TypeError if the data is not plain JSON; nothing is written then.
+    """
+    payload = json.dumps(data, separators=(",", ":"))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=cache_path.parent, prefix=cache_path.name, suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(payload)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _try_write_json_cache(cache_path: Path, data: Dict[str, Any]) -> None:
+    """Write the JSON sidecar, logging instead of raising on failure"""
+    try:
+        _write_json_cache(cache_path, data)
+    # Data that is not plain JSON (e.g. YAML dates) raises TypeError/ValueError
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Could not write template cache {cache_path}: {e}")
+
 
 class PromptType(str, Enum):
     """Types of prompts"""
@@ -22,6 +84,72 @@ class PromptType(str, Enum):
     CHAIN = "chain"
 
 
+class _CompiledTemplate:
+    """A template pre-split into literal text and variable slots.
+    
+    Parsing uses string.Template's own pattern once, so rendering matches
+    Template.safe_substitute: $$ becomes $, and unknown or invalid
+    placeholders are left as written.
+    
+    Templates with zero or one variable get a specialized `render` that
+    skips the general slot loop.
+    """
+    
+    __slots__ = ("source", "pieces", "slots", "render")
+    
+    def __init__(self, source: str):
+        self.source = source
+        # Literal text with a placeholder entry at each slot index
+        self.pieces: List[str] = []
+        self.slots: List[Tuple[int, str, str]] = []  # (index, name, placeholder text)
+        
+        text = []
+        pos = 0
+        for match in Template.pattern.finditer(source):
+            text.append(source[pos:match.start()])
+            pos = match.end()
+            name = match.group("named") or match.group("braced")
+            if name is not None:
+                self.pieces.append("".join(text))
+                self.slots.append((len(self.pieces), name, match.group()))
+                self.pieces.append(match.group())
+                text = []
+            elif match.group("escaped") is not None:
+                text.append(Template.delimiter)
+            else:
+                text.append(match.group())
+        text.append(source[pos:])
+        self.pieces.append("".join(text))
+        
+        if not self.slots:
+            self.render = self._render_static
+        elif len(self.slots) == 1:
+            self.render = self._render_single
+        else:
+            self.render = self._render_slots
+    
+    def _render_static(self, values: Dict[str, Any]) -> str:
+        """Render a template without variables"""
+        return self.pieces[0]
+    
+    def _render_single(self, values: Dict[str, Any]) -> str:
+        """Render a template with exactly one variable slot"""
+        _, name, placeholder = self.slots[0]
+        value = values.get(name, placeholder)
+        if value.__class__ is not str:
+            value = str(value)
+        head, _, tail = self.pieces
+        return head + value + tail
+    
+    def _render_slots(self, values: Dict[str, Any]) -> str:
+        """Substitute values, leaving placeholders without a value untouched"""
+        pieces = self.pieces.copy()
+        for index, name, placeholder in self.slots:
+            value = values.get(name, placeholder)
+            pieces[index] = value if value.__class__ is str else str(value)
+        return "".join(pieces)
+
+
 @dataclass
 class PromptTemplate:
     """A reusable prompt template"""
@@ -31,30 +159,46 @@ class PromptTemplate:
     description: Optional[str] = None
     variables: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Compiled template and extracted variables, rebuilt when `template` changes
+    _compiled: Optional["_CompiledTemplate"] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _extracted: Optional[Tuple[str, List[str]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def _get_compiled(self) -> "_CompiledTemplate":
+        """Get the compiled template, recompiling only if `template` was reassigned"""
+        compiled = self._compiled
+        if compiled is None or compiled.source is not self.template:
+            compiled = self._compiled = _CompiledTemplate(self.template)
+        return compiled
     
     def format(self, **kwargs) -> str:
         """Format the template with provided variables"""
-        # Use Template for safe substitution
-        tmpl = Template(self.template)
+        compiled = self._get_compiled()
         
         # Check for missing variables
-        missing = set(self.variables) - set(kwargs.keys())
-        if missing:
-            logger.warning(f"Missing variables for template '{self.name}': {missing}")
+        if self.variables:
+            missing = set(self.variables).difference(kwargs)
+            if missing:
+                logger.warning(f"Missing variables for template '{self.name}': {missing}")
         
         # Perform substitution
         try:
-            return tmpl.safe_substitute(**kwargs)
+            return compiled.render(kwargs)
         except Exception as e:
             logger.error(f"Error formatting template '{self.name}': {e}")
             raise
     
     def extract_variables(self) -> List[str]:
         """Extract variable names from template"""
-        # Find all $variable or ${variable} patterns
-        pattern = r'\$\{?(\w+)\}?'
-        variables = re.findall(pattern, self.template)
-        return list(set(variables))
+        if self._extracted is not None and self._extracted[0] is self.template:
+            return list(self._extracted[1])
+        
+        variables = list(set(_VAR_RE.findall(self.template)))
+        self._extracted = (self.template, variables)
+        return list(variables)
     
     def validate(self) -> bool:
         """Validate the template"""
@@ -165,16 +309,40 @@ class PromptLibrary:
         }
     
     def load_from_file(self, file_path: Path) -> None:
-        """Load templates from a YAML or JSON file"""
+        """Load templates from a YAML or JSON file.
+        
+        YAML files are read through their JSON sidecar when it is at least as
+        new as the YAML; otherwise the YAML is parsed and the sidecar rewritten.
+        """
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        with open(file_path, "r") as f:
-            if file_path.suffix in [".yaml", ".yml"]:
-                data = yaml.safe_load(f)
-            else:
+        if file_path.suffix not in YAML_SUFFIXES:
+            with open(file_path, "r") as f:
                 data = json.load(f)
+            self._add_templates_from_data(data)
+            return
+        
+        cache_path = _json_cache_path(file_path)
+        data = None
+        try:
+            if cache_path.stat().st_mtime >= file_path.stat().st_mtime:
+                with open(cache_path, "r") as f:
+                    data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        
+        if data is not None:
+            self._add_templates_from_data(data)
+            return
         
+        with open(file_path, "r") as f:
+            data = _load_yaml(f)
+        self._add_templates_from_data(data)
+        _try_write_json_cache(cache_path, data)
+    
+    def _add_templates_from_data(self, data: Dict[str, Any]) -> None:
+        """Add templates from loaded file data"""
         for template_data in data.get("templates", []):
             template = PromptTemplate(
                 name=template_data["name"],
@@ -187,7 +355,10 @@ class PromptLibrary:
             self.add_template(template)
     
     def save_to_file(self, file_path: Path) -> None:
-        """Save templates to a YAML or JSON file"""
+        """Save templates to a YAML or JSON file.
+        
+        YAML files also get a compact JSON sidecar for load_from_file().
+        """
         data = {
             "templates": [
                 {
@@ -205,136 +376,10 @@ class PromptLibrary:
         file_path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(file_path, "w") as f:
-            if file_path.suffix in [".yaml", ".yml"]:
-                yaml.dump(data, f, default_flow_style=False)
+            if file_path.suffix in YAML_SUFFIXES:
+                _dump_yaml(data, f)
             else:
                 json.dump(data, f, indent=2)
-
-
-class PromptChain:
-    """Chain multiple prompts together"""
-    
-    def __init__(self, name: str):
-        self.name = name
-        self.steps: List[Dict[str, Any]] = []
-        self.context: Dict[str, Any] = {}
-    
-    def add_step(
-        self,
-        template_name: str,
-        variables: Dict[str, Any],
-        output_key: str,
-    ) -> "PromptChain":
-        """Add a step to the chain"""
-        self.steps.append({
-            "template": template_name,
-            "variables": variables,
-            "output_key": output_key,
-        })
-        return self
-    
-    async def execute(
-        self,
-        library: PromptLibrary,
-        llm_client,
-        initial_context: Optional[Dict[str, Any]] = None,
-    ) -> Dict[str, Any]:
-        """Execute the prompt chain"""
-        from .base import ChatMessage
-        
-        # Initialize context
-        self.context = initial_context or {}
-        results = {}
-        
-        for i, step in enumerate(self.steps):
-            # Get template
-            template_name = step["template"]
-            template = library.get_template(template_name)
-            if not template:
-                raise ValueError(f"Template '{template_name}' not found")
-            
-            # Prepare variables
-            variables = {}
-            for key, value in step["variables"].items():
-                if isinstance(value, str) and value.startswith("$"):
-                    # Reference to context variable
-                    var_name = value[1:]
-                    if var_name in self.context:
-                        variables[key] = self.context[var_name]
-                    elif var_name in results:
-                        variables[key] = results[var_name]
-                    else:
-                        raise ValueError(f"Variable '{var_name}' not found in context")
-                else:
-                    variables[key] = value
-            
-            # Format prompt
-            prompt = template.format(**variables)
-            
-            # Execute with LLM
-            logger.info(f"Executing chain step {i+1}: {template_name}")
-            
-            if template.type == PromptType.SYSTEM:
-                messages = [
-                    ChatMessage(role="system", content=prompt),
-                    ChatMessage(role="user", content="Please proceed."),
-                ]
-                response = await llm_client.chat(messages)
-            else:
-                response = await llm_client.generate(prompt)
-            
-            # Store result
-            output_key = step["output_key"]
-            results[output_key] = response.text
-            self.context[output_key] = response.text
-        
-        return results
-
-
-class PromptOptimizer:
-    """Optimize prompts for better performance"""
-    
-    @staticmethod
-    def optimize_for_model(prompt: str, model: str) -> str:
-        """Optimize prompt for specific model"""
-        # Model-specific optimizations
-        if "gpt" in model.lower():
-            # OpenAI GPT optimizations
-            prompt = PromptOptimizer._add_gpt_instructions(prompt)
-        elif "claude" in model.lower():
-            # Anthropic Claude optimizations
-            prompt = PromptOptimizer._add_claude_instructions(prompt)
-        
-        return prompt
-    
-    @staticmethod
-    def _add_gpt_instructions(prompt: str) -> str:
-        """Add GPT-specific instructions"""
-        # GPT models respond well to clear structure
-        if "step by step" not in prompt.lower():
-            prompt += "\n\nPlease think step by step."
-        return prompt
-    
-    @staticmethod
-    def _add_claude_instructions(prompt: str) -> str:
-        """Add Claude-specific instructions"""
-        # Claude models respond well to politeness and clarity
-        if not prompt.startswith("Please"):
-            prompt = "Please " + prompt[0].lower() + prompt[1:]
-        return prompt
-    
-    @staticmethod
-    def add_output_format(prompt: str, format_type: str) -> str:
-        """Add output format instructions"""
-        format_instructions = {
-            "json": "\n\nPlease format your response as valid JSON.",
-            "markdown": "\n\nPlease format your response using Markdown.",
-            "bullet": "\n\nPlease format your response as bullet points.",
-            "numbered": "\n\nPlease format your response as a numbered list.",
-        }
-        
-        instruction = format_instructions.get(format_type, "")
-        if instruction and instruction not in prompt:
-            prompt += instruction
         
-        return prompt
\ No newline at end of file
+        if file_path.suffix in YAML_SUFFIXES:
+            _try_write_json_cache(_json_cache_path(file_path), data)
@@ -0,0 +1,42 @@
+"""
+Request rate limiting for LLM clients
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Async token bucket allowing a fixed number of requests per minute"""
+
+    def __init__(self, requests_per_minute: int, capacity: Optional[int] = None):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = capacity or max(1, requests_per_minute)
+        self.tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the bucket limits anything (a rate of 0 means unlimited)"""
+        return self.rate > 0
+
+    async def acquire(self):
+        """Wait until a request token is available and take it"""
+        if not self.enabled:
+            return
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
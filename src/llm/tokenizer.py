@@ -0,0 +1,111 @@
+"""
+Token counting helpers shared by the LLM clients
+"""
+
+import os
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Optional, Sequence, Tuple, Union
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+DEFAULT_ENCODING = "cl100k_base"
+
+# Chat format overhead (OpenAI cookbook values)
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_NAME = 1
+REPLY_PRIMING_TOKENS = 3
+
+# Memoized token counts, keyed by (model, text or digest of long text)
+TOKEN_COUNT_CACHE_SIZE = 4096
+_LONG_TEXT_CHARS = 256
+_token_counts: "OrderedDict[Tuple[Optional[str], Union[str, bytes]], int]" = OrderedDict()
+
+# Texts shorter than this may be estimated instead of encoded when exact=False
+FAST_PATH_MAX_CHARS = 64
+
+
+@lru_cache(maxsize=8)
+def get_encoding_by_name(name: str = DEFAULT_ENCODING):
+    """Get a tiktoken encoding by name, loading its BPE table only once"""
+    return tiktoken.get_encoding(name)
+
+
+@lru_cache(maxsize=32)
+def get_encoding(model: Optional[str] = None):
+    """Get the tiktoken encoding for a model, falling back to cl100k_base"""
+    if model is None:
+        return get_encoding_by_name(DEFAULT_ENCODING)
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return get_encoding_by_name(DEFAULT_ENCODING)
+
+
+def _count_encoded(encoding, text: str) -> int:
+    """Count tokens treating special-token strings as plain text.
+    
+    encode_ordinary skips the special-token scan that encode() performs,
+    and never raises on text that happens to contain e.g. <|endoftext|>.
+    """
+    return len(encoding.encode_ordinary(text))
+
+
+def _text_key(text: str) -> Union[str, bytes]:
+    """Use short texts directly as cache keys and a digest for long ones"""
+    if len(text) <= _LONG_TEXT_CHARS:
+        return text
+    return blake2b(text.encode(), digest_size=16).digest()
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (about 4 UTF-8 bytes per token, rounded up)"""
+    return (len(text.encode("utf-8")) + 3) // 4
+
+
+def count_tokens(text: str, model: Optional[str] = None, exact: bool = True) -> int:
+    """Count tokens in text, memoizing results for repeated inputs.
+    
+    With exact=False, short texts are estimated without running the
+    tokenizer, which is enough for budget checks.
+    """
+    if not exact and len(text) < FAST_PATH_MAX_CHARS:
+        return estimate_tokens(text)
+    
+    key = (model, _text_key(text))
+    count = _token_counts.get(key)
+    if count is not None:
+        _token_counts.move_to_end(key)
+        return count
+    
+    count = _count_encoded(get_encoding(model), text)
+    _token_counts[key] = count
+    if len(_token_counts) > TOKEN_COUNT_CACHE_SIZE:
+        _token_counts.popitem(last=False)
+    return count
+
+
+def count_message_tokens(messages: Sequence, model: Optional[str] = None) -> int:
+    """Count tokens for chat messages with a single batched encode call"""
+    if not messages:
+        return 0
+    
+    texts = []
+    overhead = REPLY_PRIMING_TOKENS
+    for msg in messages:
+        if msg.name:
+            texts.append(f"{msg.role}\n{msg.name}\n{msg.content}")
+            overhead += TOKENS_PER_MESSAGE + TOKENS_PER_NAME
+        else:
+            texts.append(f"{msg.role}\n{msg.content}")
+            overhead += TOKENS_PER_MESSAGE
+    
+    encoded = get_encoding(model).encode_ordinary_batch(
+        texts, num_threads=os.cpu_count() or 1
+    )
+    return overhead + sum(len(tokens) for tokens in encoded)
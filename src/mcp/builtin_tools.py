@@ -1,10 +1,19 @@
 import json
+import mmap
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 from datetime import datetime
 
 from ..utils import chunk_text, hash_text, get_timestamp
+from .listing import glob_entries, scan_entries
+
+
+# Buffer size for appending to files (fewer write syscalls than the 8 KB default)
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Files at least this large are decoded from a memory map
+MMAP_READ_THRESHOLD = 64 << 20
 
 
 def register_builtin_tools(server):
@@ -123,14 +132,28 @@ def read_file_handler(path: str, encoding: str = "utf-8") -> Dict[str, Any]:
         return {"error": f"Path is not a file: {path}"}
     
     try:
-        with open(file_path, "r", encoding=encoding) as f:
-            content = f.read()
+        with open(file_path, encoding=encoding) as f:
+            fd = f.fileno()
+            stat = os.fstat(fd)
+            if hasattr(os, "posix_fadvise"):
+                # Let the kernel read ahead aggressively for this sequential read
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            
+            if stat.st_size >= MMAP_READ_THRESHOLD:
+                # Decode straight from the page cache, skipping the intermediate bytes copy
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+                    content = str(mapped, encoding)
+                if "\r" in content:
+                    content = content.replace("\r\n", "\n").replace("\r", "\n")
+            else:
+                # A single read sized to the file instead of many buffer-sized reads
+                content = f.read()
         
         return {
             "path": str(file_path.absolute()),
             "content": content,
             "size": len(content),
-            "modified": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat(),
+            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
         }
     except Exception as e:
         return {"error": f"Error reading file: {str(e)}"}
@@ -149,9 +172,11 @@ def write_file_handler(
         # Create parent directories if they don't exist
         file_path.parent.mkdir(parents=True, exist_ok=True)
         
-        mode = "a" if append else "w"
-        with open(file_path, mode, encoding=encoding) as f:
-            f.write(content)
+        if append:
+            with open(file_path, "a", encoding=encoding, buffering=WRITE_BUFFER_SIZE) as f:
+                f.write(content)
+        else:
+            file_path.write_text(content, encoding=encoding)
         
         return {
             "path": str(file_path.absolute()),
@@ -178,26 +203,12 @@ def list_directory_handler(
         return {"error": f"Path is not a directory: {path}"}
     
     try:
-        files = []
-        directories = []
-        
-        if recursive:
-            items = dir_path.rglob(pattern)
+        # Patterns with path components need glob; plain name patterns are
+        # matched against scandir entries using their cached types
+        if os.sep in pattern or "/" in pattern or "**" in pattern:
+            files, directories = glob_entries(dir_path, pattern, recursive)
         else:
-            items = dir_path.glob(pattern)
-        
-        for item in items:
-            info = {
-                "name": item.name,
-                "path": str(item.relative_to(dir_path)),
-                "size": item.stat().st_size if item.is_file() else 0,
-                "modified": datetime.fromtimestamp(item.stat().st_mtime).isoformat(),
-            }
-            
-            if item.is_file():
-                files.append(info)
-            elif item.is_dir():
-                directories.append(info)
+            files, directories = scan_entries(str(dir_path), pattern, recursive)
         
         return {
             "path": str(dir_path.absolute()),
@@ -222,14 +233,9 @@ def chunk_text_handler(
         "total_chunks": len(chunks),
         "chunk_size": chunk_size,
         "overlap": overlap,
-        "chunks": [
-            {
-                "index": i,
-                "content": chunk,
-                "length": len(chunk),
-            }
-            for i, chunk in enumerate(chunks)
-        ],
+        # Parallel arrays rather than a dict per chunk; chunk i is chunks[i]
+        "chunks": chunks,
+        "lengths": [len(chunk) for chunk in chunks],
     }
 
 
@@ -245,7 +251,10 @@ def hash_text_handler(text: str) -> Dict[str, Any]:
 def get_system_info_handler() -> Dict[str, Any]:
     """Get system information"""
     import platform
-    import psutil
+    from . import system_metrics
+    
+    memory = system_metrics.virtual_memory()
+    disk = system_metrics.disk_usage("/")
     
     return {
         "platform": {
@@ -257,19 +266,19 @@ def get_system_info_handler() -> Dict[str, Any]:
             "python_version": platform.python_version(),
         },
         "cpu": {
-            "count": psutil.cpu_count(),
-            "percent": psutil.cpu_percent(interval=1),
+            "count": system_metrics.cpu_count(),
+            "percent": system_metrics.cpu_percent(),
         },
         "memory": {
-            "total": psutil.virtual_memory().total,
-            "available": psutil.virtual_memory().available,
-            "percent": psutil.virtual_memory().percent,
+            "total": memory.total,
+            "available": memory.available,
+            "percent": memory.percent,
         },
         "disk": {
-            "total": psutil.disk_usage("/").total,
-            "used": psutil.disk_usage("/").used,
-            "free": psutil.disk_usage("/").free,
-            "percent": psutil.disk_usage("/").percent,
+            "total": disk.total,
+            "used": disk.used,
+            "free": disk.free,
+            "percent": disk.percent,
         },
         "timestamp": get_timestamp(),
     }
@@ -0,0 +1,155 @@
+"""
+Directory listing helpers for the list_directory tool
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from fnmatch import fnmatchcase
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..utils import setup_logging
+
+
+# Threads used to walk subdirectories for recursive listings
+LIST_WORKERS = 16
+
+Entries = Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]
+
+logger = setup_logging("DirectoryListing")
+
+_entry_path = itemgetter("path")
+
+
+def glob_entries(dir_path: Path, pattern: str, recursive: bool) -> Entries:
+    """Collect (files, directories) info dicts for a path pattern with Path.glob"""
+    files = []
+    directories = []
+    
+    for item in dir_path.rglob(pattern) if recursive else dir_path.glob(pattern):
+        try:
+            stat = item.stat()
+            is_file = item.is_file()
+            if not is_file and not item.is_dir():
+                continue
+        except OSError as e:
+            logger.warning(f"Skipping {item}: {e}")
+            continue
+        
+        info = {
+            "name": item.name,
+            "path": str(item.relative_to(dir_path)),
+            "size": stat.st_size if is_file else 0,
+            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        }
+        
+        if is_file:
+            files.append(info)
+        else:
+            directories.append(info)
+    
+    files.sort(key=_entry_path)
+    directories.sort(key=_entry_path)
+    return files, directories
+
+
+def scan_entries(dir_path: str, pattern: str, recursive: bool) -> Entries:
+    """Collect (files, directories) info dicts for a name pattern with os.scandir"""
+    subdirs: List[Tuple[str, str]] = []
+    files, directories = _collect_entries(
+        dir_path, "", pattern, recursive=False,
+        subdirs=subdirs if recursive else None,
+    )
+    
+    # Subtrees are walked in parallel; scandir and stat release the GIL
+    if subdirs:
+        with ThreadPoolExecutor(max_workers=min(LIST_WORKERS, len(subdirs))) as executor:
+            for sub_files, sub_directories in executor.map(
+                lambda subdir: _collect_subtree(*subdir, pattern), subdirs
+            ):
+                files.extend(sub_files)
+                directories.extend(sub_directories)
+    
+    # Scandir order is filesystem-dependent; sort for stable listings
+    files.sort(key=_entry_path)
+    directories.sort(key=_entry_path)
+    return files, directories
+
+
+def _collect_subtree(dir_path: str, prefix: str, pattern: str) -> Entries:
+    """Collect one subtree on a worker; a failure drops only that subtree"""
+    try:
+        return _collect_entries(dir_path, prefix, pattern, recursive=True)
+    except Exception as e:
+        logger.warning(f"Skipping subtree {dir_path}: {e}")
+        return [], []
+
+
+def _collect_entries(
+    dir_path: str,
+    prefix: str,
+    pattern: str,
+    recursive: bool,
+    subdirs: Optional[List[Tuple[str, str]]] = None,
+) -> Entries:
+    """Collect (files, directories) info dicts for entries matching pattern"""
+    files = []
+    directories = []
+    
+    for entry, relative_path in _scan_directory(dir_path, prefix, recursive, subdirs):
+        if not fnmatchcase(entry.name, pattern):
+            continue
+        
+        # DirEntry caches its type and stat results, so each entry costs one stat
+        try:
+            is_file = entry.is_file()
+            if not is_file and not entry.is_dir():
+                continue
+            stat = entry.stat()
+        except OSError as e:
+            logger.warning(f"Skipping {entry.path}: {e}")
+            continue
+        
+        info = {
+            "name": entry.name,
+            "path": relative_path,
+            "size": stat.st_size if is_file else 0,
+            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        }
+        
+        if is_file:
+            files.append(info)
+        else:
+            directories.append(info)
+    
+    return files, directories
+
+
+def _scan_directory(
+    dir_path: str,
+    prefix: str,
+    recursive: bool,
+    subdirs: Optional[List[Tuple[str, str]]] = None,
+) -> Iterator[Tuple[os.DirEntry, str]]:
+    """Yield (entry, path relative to the listing root) using os.scandir
+
+    Subdirectories are descended into when recursive, otherwise they are
+    appended to subdirs (if given) as (path, prefix) for the caller to walk.
+    Directories that cannot be read are logged and skipped, as Path.glob does.
+    """
+    stack = [(dir_path, prefix)]
+    while stack:
+        current, prefix = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    relative_path = prefix + entry.name
+                    yield entry, relative_path
+                    if (recursive or subdirs is not None) and entry.is_dir(follow_symlinks=False):
+                        (stack if recursive else subdirs).append(
+                            (entry.path, relative_path + os.sep)
+                        )
+        except OSError as e:
+            logger.warning(f"Skipping unreadable directory {current}: {e}")
@@ -1,19 +1,58 @@
 import asyncio
-from typing import Any, Callable, Dict, List, Optional
+import mmap
+import os
+from fnmatch import fnmatchcase
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Union
 from mcp.types import Resource
 import logging
-from pathlib import Path
+from pathlib import Path, PurePath
 import mimetypes
+from functools import partial
 
 from ..utils import setup_logging
 
 
+# File resources at least this large are decoded straight from a memory map
+MMAP_READ_THRESHOLD = 1 << 20
+
+
+def _read_text_file(file_path: Union[str, Path]) -> str:
+    """Read a UTF-8 text file (blocking, so run it in an executor)"""
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_READ_THRESHOLD:
+            # Decode from the page cache without an intermediate bytes copy,
+            # so a large file is held in memory once (as the str) instead of twice
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                text = str(mapped, "utf-8")
+        else:
+            # One sized read and one decode, skipping the text layer's incremental decoder
+            text = f.read().decode("utf-8")
+    # Match text-mode newline handling
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+@dataclass(slots=True)
+class ResourceRecord:
+    """Everything known about a registered resource, behind a single lookup"""
+    uri: str
+    name: str
+    description: str
+    mime_type: str
+    handler: Callable
+    # Coroutine check done once at registration
+    is_async: bool
+    # Resource model built once and shared by the list/get calls
+    resource: Resource
+
+
 class ResourceManager:
     """Manager for MCP resources"""
 
     def __init__(self):
-        self.resources: Dict[str, Dict[str, Any]] = {}
-        self.handlers: Dict[str, Callable] = {}
+        self.resources: Dict[str, ResourceRecord] = {}
         self.logger = setup_logging("ResourceManager")
 
     def register_resource(
@@ -31,13 +70,20 @@ class ResourceManager:
         if not callable(handler):
             raise TypeError(f"Handler for resource '{uri}' must be callable")
 
-        self.resources[uri] = {
-            "uri": uri,
-            "name": name,
-            "description": description,
-            "mimeType": mime_type,
-        }
-        self.handlers[uri] = handler
+        self.resources[uri] = ResourceRecord(
+            uri=uri,
+            name=name,
+            description=description,
+            mime_type=mime_type,
+            handler=handler,
+            is_async=asyncio.iscoroutinefunction(handler),
+            resource=Resource(
+                uri=uri,
+                name=name,
+                description=description,
+                mimeType=mime_type,
+            ),
+        )
         self.logger.info(f"Registered resource: {uri}")
 
     def unregister_resource(self, uri: str) -> None:
@@ -46,50 +92,32 @@ class ResourceManager:
             raise ValueError(f"Resource '{uri}' is not registered")
 
         del self.resources[uri]
-        del self.handlers[uri]
         self.logger.info(f"Unregistered resource: {uri}")
 
     def get_resource(self, uri: str) -> Optional[Resource]:
         """Get a specific resource definition"""
-        if uri not in self.resources:
-            return None
-
-        res = self.resources[uri]
-        return Resource(
-            uri=res["uri"],
-            name=res["name"],
-            description=res["description"],
-            mimeType=res["mimeType"],
-        )
+        record = self.resources.get(uri)
+        return record.resource if record else None
 
     def get_all_resources(self) -> List[Resource]:
         """Get all registered resources"""
-        return [
-            Resource(
-                uri=res["uri"],
-                name=res["name"],
-                description=res["description"],
-                mimeType=res["mimeType"],
-            )
-            for res in self.resources.values()
-        ]
+        return [record.resource for record in self.resources.values()]
 
     async def read_resource(self, uri: str) -> str:
         """Read a resource by URI"""
-        if uri not in self.handlers:
+        record = self.resources.get(uri)
+        if record is None:
             # Try to handle file:// URIs
             if uri.startswith("file://"):
                 return await self._read_file_resource(uri)
             raise ValueError(f"Resource '{uri}' is not registered")
-
-        handler = self.handlers[uri]
         
         try:
-            if asyncio.iscoroutinefunction(handler):
-                content = await handler()
+            if record.is_async:
+                content = await record.handler()
             else:
-                loop = asyncio.get_event_loop()
-                content = await loop.run_in_executor(None, handler)
+                loop = asyncio.get_running_loop()
+                content = await loop.run_in_executor(None, record.handler)
             
             self.logger.info(f"Successfully read resource: {uri}")
             return content
@@ -114,8 +142,9 @@ class ResourceManager:
             raise ValueError(f"Path is not a file: {path}")
         
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
+            # Read off the event loop, like the handlers of registered resources
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, _read_text_file, file_path)
         except Exception as e:
             self.logger.error(f"Error reading file {path}: {e}")
             raise
@@ -130,27 +159,42 @@ class ResourceManager:
         if not directory.exists() or not directory.is_dir():
             raise ValueError(f"Invalid directory: {directory}")
         
+        # Patterns with path components need glob; plain name patterns are
+        # matched against a single scandir pass using its cached entry types
+        if os.sep in pattern or "/" in pattern or "**" in pattern:
+            matches = (
+                (str(file_path.absolute()), file_path.name)
+                for file_path in directory.glob(pattern)
+                if file_path.is_file()
+            )
+        else:
+            root = str(directory.absolute())
+            with os.scandir(root) as entries:
+                matches = [
+                    (os.path.join(root, entry.name), entry.name)
+                    for entry in entries
+                    if fnmatchcase(entry.name, pattern) and entry.is_file()
+                ]
+        
         count = 0
-        for file_path in directory.glob(pattern):
-            if file_path.is_file():
-                uri = f"{base_uri}{file_path.absolute()}"
-                mime_type, _ = mimetypes.guess_type(str(file_path))
-                mime_type = mime_type or "text/plain"
-                
-                def make_handler(path):
-                    def handler():
-                        with open(path, "r", encoding="utf-8") as f:
-                            return f.read()
-                    return handler
-                
-                self.register_resource(
-                    uri=uri,
-                    name=file_path.name,
-                    description=f"File resource: {file_path.name}",
-                    mime_type=mime_type,
-                    handler=make_handler(file_path),
-                )
-                count += 1
+        # MIME types are looked up once per distinct extension chain; the
+        # whole chain is the key because e.g. .tar.gz and .gz guess differently
+        mime_types: Dict[str, str] = {}
+        for path, name in matches:
+            suffix = "".join(PurePath(name).suffixes).lower()
+            mime_type = mime_types.get(suffix)
+            if mime_type is None:
+                guessed, _ = mimetypes.guess_type(name)
+                mime_type = mime_types[suffix] = guessed or "text/plain"
+            
+            self.register_resource(
+                uri=f"{base_uri}{path}",
+                name=name,
+                description=f"File resource: {name}",
+                mime_type=mime_type,
+                handler=partial(_read_text_file, path),
+            )
+            count += 1
         
         self.logger.info(f"Registered {count} file resources from {directory}")
         return count
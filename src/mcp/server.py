@@ -1,6 +1,6 @@
 import asyncio
-import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Callable
 from pathlib import Path
 
@@ -10,7 +10,7 @@ from mcp.server.stdio import stdio_server
 from mcp.types import Tool, Resource, TextContent, ImageContent, EmbeddedResource
 
 from ..config import settings
-from ..utils import setup_logging, generate_id, get_timestamp
+from ..utils import dumps_json, setup_logging, generate_id, get_timestamp
 from .tools import ToolRegistry
 from .resources import ResourceManager
 
@@ -47,7 +47,7 @@ class MCPServer:
             self.logger.info(f"Calling tool: {name} with arguments: {arguments}")
             try:
                 result = await self.tool_registry.execute_tool(name, arguments)
-                return [TextContent(type="text", text=json.dumps(result, indent=2))]
+                return [TextContent(type="text", text=dumps_json(result))]
             except Exception as e:
                 self.logger.error(f"Error executing tool {name}: {e}")
                 return [TextContent(type="text", text=f"Error: {str(e)}")]
@@ -112,14 +112,24 @@ class MCPServer:
             ),
         )
         
+        # Sync tool and resource handlers run on this pool via run_in_executor
+        executor = ThreadPoolExecutor(
+            max_workers=settings.thread_pool_size,
+            thread_name_prefix="mcp-tool",
+        )
+        asyncio.get_running_loop().set_default_executor(executor)
+        
         # Run the server
-        async with stdio_server() as (read_stream, write_stream):
-            self.logger.info("MCP server running on stdio transport")
-            await self.server.run(
-                read_stream,
-                write_stream,
-                init_options,
-            )
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                self.logger.info("MCP server running on stdio transport")
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    init_options,
+                )
+        finally:
+            executor.shutdown(wait=False)
 
 
 async def main():
@@ -0,0 +1,56 @@
+"""
+Cached psutil probes shared by the system tools and health resource
+"""
+
+import time
+from functools import lru_cache, wraps
+
+import psutil
+
+
+# Probe results are reused for this long, so bursts of calls cost one syscall
+PROBE_TTL_SECONDS = 0.5
+
+
+def _cached_probe(func):
+    """Memoize a probe per argument tuple within PROBE_TTL_SECONDS time buckets"""
+    cache = {}
+
+    @wraps(func)
+    def wrapper(*args):
+        bucket = time.monotonic() // PROBE_TTL_SECONDS
+        cached = cache.get(args)
+        if cached is not None and cached[0] == bucket:
+            return cached[1]
+        value = func(*args)
+        cache[args] = (bucket, value)
+        return value
+
+    return wrapper
+
+
+@_cached_probe
+def virtual_memory():
+    """System memory usage"""
+    return psutil.virtual_memory()
+
+
+@_cached_probe
+def disk_usage(path: str = "/"):
+    """Disk usage for the filesystem containing path"""
+    return psutil.disk_usage(path)
+
+
+@lru_cache(maxsize=1)
+def cpu_count() -> int:
+    """Number of logical CPUs"""
+    return psutil.cpu_count()
+
+
+def cpu_percent() -> float:
+    """CPU utilization since the previous call, without blocking"""
+    return psutil.cpu_percent(interval=None)
+
+
+# The first non-blocking cpu_percent() call only sets the baseline
+cpu_percent()
@@ -1,18 +1,56 @@
 import asyncio
 import inspect
-from typing import Any, Callable, Dict, List, Optional
+from functools import partial
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from mcp.types import Tool
 import logging
 
 from ..utils import setup_logging
 
 
+# Python types accepted for each JSON schema type
+_TYPE_MAP = {
+    "string": str,
+    "number": (int, float),
+    "integer": int,
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+    "null": type(None),
+}
+
+
+def _property_types(input_schema: Dict[str, Any]) -> Tuple[Tuple[str, str, Any], ...]:
+    """(property, schema type, Python types) for each property with a known type"""
+    return tuple(
+        (key, prop["type"], _TYPE_MAP[prop["type"]])
+        for key, prop in input_schema.get("properties", {}).items()
+        if isinstance(prop.get("type"), str) and prop["type"] in _TYPE_MAP
+    )
+
+
+@dataclass(slots=True)
+class ToolRecord:
+    """Everything known about a registered tool, behind a single lookup"""
+    name: str
+    description: str
+    input_schema: Dict[str, Any]
+    handler: Callable
+    # Coroutine check done once at registration
+    is_async: bool
+    # Tool model built once and shared by the list/get calls
+    tool: Tool
+    # Validation data extracted from input_schema at registration
+    required: Tuple[str, ...]
+    property_types: Tuple[Tuple[str, str, Any], ...]
+
+
 class ToolRegistry:
     """Registry for managing MCP tools"""
 
     def __init__(self):
-        self.tools: Dict[str, Dict[str, Any]] = {}
-        self.handlers: Dict[str, Callable] = {}
+        self.tools: Dict[str, ToolRecord] = {}
         self.logger = setup_logging("ToolRegistry")
 
     def register_tool(
@@ -31,12 +69,20 @@ class ToolRegistry:
             raise TypeError(f"Handler for tool '{name}' must be callable")
 
         # Store tool definition
-        self.tools[name] = {
-            "name": name,
-            "description": description,
-            "inputSchema": input_schema,
-        }
-        self.handlers[name] = handler
+        self.tools[name] = ToolRecord(
+            name=name,
+            description=description,
+            input_schema=input_schema,
+            handler=handler,
+            is_async=asyncio.iscoroutinefunction(handler),
+            tool=Tool(
+                name=name,
+                description=description,
+                inputSchema=input_schema,
+            ),
+            required=tuple(input_schema.get("required", ())),
+            property_types=_property_types(input_schema),
+        )
         self.logger.info(f"Registered tool: {name}")
 
     def unregister_tool(self, name: str) -> None:
@@ -45,47 +91,34 @@ class ToolRegistry:
             raise ValueError(f"Tool '{name}' is not registered")
 
         del self.tools[name]
-        del self.handlers[name]
         self.logger.info(f"Unregistered tool: {name}")
 
     def get_tool(self, name: str) -> Optional[Tool]:
         """Get a specific tool definition"""
-        if name not in self.tools:
-            return None
-
-        tool_def = self.tools[name]
-        return Tool(
-            name=tool_def["name"],
-            description=tool_def["description"],
-            inputSchema=tool_def["inputSchema"],
-        )
+        record = self.tools.get(name)
+        return record.tool if record else None
 
     def get_all_tools(self) -> List[Tool]:
         """Get all registered tools"""
-        return [
-            Tool(
-                name=tool["name"],
-                description=tool["description"],
-                inputSchema=tool["inputSchema"],
-            )
-            for tool in self.tools.values()
-        ]
+        return [record.tool for record in self.tools.values()]
 
     async def execute_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
         """Execute a tool with given arguments"""
-        if name not in self.handlers:
+        record = self.tools.get(name)
+        if record is None:
             raise ValueError(f"Tool '{name}' is not registered")
 
-        handler = self.handlers[name]
+        handler = record.handler
         
         try:
             # Check if handler is async
-            if asyncio.iscoroutinefunction(handler):
+            if record.is_async:
                 result = await handler(**arguments)
             else:
                 # Run sync handler in executor to avoid blocking
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(None, handler, **arguments)
+                # run_in_executor only forwards positional arguments
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(None, partial(handler, **arguments))
             
             self.logger.info(f"Successfully executed tool: {name}")
             return result
@@ -96,51 +129,27 @@ class ToolRegistry:
 
     def validate_arguments(self, name: str, arguments: Dict[str, Any]) -> bool:
         """Validate tool arguments against schema"""
-        if name not in self.tools:
+        record = self.tools.get(name)
+        if record is None:
             return False
 
-        schema = self.tools[name]["inputSchema"]
-        
         # Check required properties
-        required = schema.get("required", [])
-        for prop in required:
+        for prop in record.required:
             if prop not in arguments:
                 self.logger.error(f"Missing required argument '{prop}' for tool '{name}'")
                 return False
 
         # Check property types (basic validation)
-        properties = schema.get("properties", {})
-        for key, value in arguments.items():
-            if key in properties:
-                expected_type = properties[key].get("type")
-                if expected_type:
-                    if not self._check_type(value, expected_type):
-                        self.logger.error(
-                            f"Invalid type for argument '{key}' in tool '{name}': "
-                            f"expected {expected_type}, got {type(value).__name__}"
-                        )
-                        return False
+        for key, expected_type, expected in record.property_types:
+            if key in arguments and not isinstance(arguments[key], expected):
+                self.logger.error(
+                    f"Invalid type for argument '{key}' in tool '{name}': "
+                    f"expected {expected_type}, got {type(arguments[key]).__name__}"
+                )
+                return False
 
         return True
 
-    def _check_type(self, value: Any, expected_type: str) -> bool:
-        """Check if value matches expected JSON schema type"""
-        type_map = {
-            "string": str,
-            "number": (int, float),
-            "integer": int,
-            "boolean": bool,
-            "array": list,
-            "object": dict,
-            "null": type(None),
-        }
-        
-        expected = type_map.get(expected_type)
-        if expected is None:
-            return True  # Unknown type, allow
-            
-        return isinstance(value, expected)
-
 
 def create_tool_decorator(registry: ToolRegistry):
     """Create a decorator for registering tools"""
@@ -1,11 +1,13 @@
 import logging
 import json
-from typing import Any, Dict, Optional
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime, timezone
 import hashlib
-import uuid
-from functools import wraps
+from functools import lru_cache, wraps
 import time
 import asyncio
 from logging.handlers import RotatingFileHandler
@@ -14,8 +16,20 @@ from passlib.context import CryptContext
 import secrets
 import string
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Password hashing context: new hashes use Argon2id, bcrypt hashes still
+# verify and are flagged for rehashing on the next successful login
+pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
+
+# Settings each logger was last configured with by setup_logging
+_logging_configs: Dict[str, Tuple[str, Optional[Path], bool]] = {}
+
+# Worker processes for password hashing, created on first use
+_hash_executor: Optional[ProcessPoolExecutor] = None
 
 
 def setup_logging(
@@ -26,8 +40,17 @@ def setup_logging(
 ) -> logging.Logger:
     """Set up logging with optional JSON formatting and file output"""
     logger = logging.getLogger(name)
+
+    # Repeat calls with the same settings reuse the existing handlers
+    config = (level.upper(), log_file, json_format)
+    if _logging_configs.get(name) == config:
+        return logger
+
     logger.setLevel(getattr(logging, level.upper()))
-    logger.handlers = []  # Clear existing handlers
+    # Close and clear existing handlers
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers = []
 
     # Create formatters
     if json_format:
@@ -47,7 +70,8 @@ def setup_logging(
 
     # File handler
     if log_file:
-        log_file.parent.mkdir(parents=True, exist_ok=True)
+        if not log_file.parent.is_dir():
+            log_file.parent.mkdir(parents=True, exist_ok=True)
         file_handler = RotatingFileHandler(
             log_file,
             maxBytes=10 * 1024 * 1024,  # 10MB
@@ -56,20 +80,65 @@ def setup_logging(
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
 
+    _logging_configs[name] = config
     return logger
 
 
 def generate_id(prefix: str = "") -> str:
     """Generate a unique ID with optional prefix"""
-    unique_id = str(uuid.uuid4())
+    # 128 random bits as 22 URL-safe characters, without building a UUID object
+    unique_id = secrets.token_urlsafe(16)
     if prefix:
         return f"{prefix}_{unique_id}"
     return unique_id
 
 
+# hash_text memoizes texts up to this length. With 16384 entries the cache
+# keeps at most ~4M characters of caller text alive (~4-16 MB by encoding)
+HASH_CACHE_MAX_CHARS = 256
+HASH_CACHE_SIZE = 16384
+
+
+def _sha256_text(text: str):
+    """SHA256 hash object fed with the UTF-8 encoding of text"""
+    digest = hashlib.sha256()
+    digest.update(text.encode())
+    return digest
+
+
+@lru_cache(maxsize=HASH_CACHE_SIZE)
+def _cached_hash_text(text: str) -> str:
+    """Memoized SHA256 hex digest for short texts"""
+    return _sha256_text(text).hexdigest()
+
+
 def hash_text(text: str) -> str:
     """Generate SHA256 hash of text"""
-    return hashlib.sha256(text.encode()).hexdigest()
+    if len(text) <= HASH_CACHE_MAX_CHARS:
+        return _cached_hash_text(text)
+    return _sha256_text(text).hexdigest()
+
+
+def hash_text_digest(text: str) -> bytes:
+    """Generate raw 32-byte SHA256 digest of text"""
+    return _sha256_text(text).digest()
+
+
+def fingerprint_text(text: str) -> bytes:
+    """Fast 16-byte BLAKE2b fingerprint of text for in-process deduplication.
+
+    Not interchangeable with hash_text: persisted and user-facing hashes stay SHA256.
+    """
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+def fingerprint_texts(texts: List[str]) -> bytes:
+    """16-byte BLAKE2b fingerprint of an ordered list of texts"""
+    # Hashing fixed-size per-text fingerprints keeps text boundaries unambiguous
+    digest = hashlib.blake2b(digest_size=16)
+    for text in texts:
+        digest.update(fingerprint_text(text))
+    return digest.digest()
 
 
 def get_timestamp() -> str:
@@ -129,32 +198,28 @@ def retry_sync(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
 
 def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> list[str]:
     """Split text into overlapping chunks"""
-    chunks = []
-    start = 0
-    text_length = len(text)
+    step = chunk_size - overlap
+    if step <= 0:
+        raise ValueError("overlap must be smaller than chunk_size")
+    if not text:
+        return []
 
-    while start < text_length:
-        end = min(start + chunk_size, text_length)
-        chunk = text[start:end]
-        chunks.append(chunk)
+    # Start of the first chunk that reaches the end of the text
+    last_start = max(0, -(-(len(text) - chunk_size) // step)) * step
+    return [text[start:start + chunk_size] for start in range(0, last_start + 1, step)]
 
-        if end >= text_length:
-            break
 
-        start = end - overlap
-
-    return chunks
+# Characters stripped by sanitize_filename
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w\s\-\.]")
 
 
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename to prevent path traversal attacks"""
-    import re
-
     # Remove any path components
     filename = Path(filename).name
 
     # Remove special characters
-    filename = re.sub(r"[^\w\s\-\.]", "", filename)
+    filename = _UNSAFE_FILENAME_CHARS.sub("", filename)
 
     # Replace spaces with underscores
     filename = filename.replace(" ", "_")
@@ -179,9 +244,24 @@ def load_json_file(file_path: Path) -> Dict[str, Any]:
         raise ValueError(f"Invalid JSON in {file_path}: {e}")
 
 
+def dumps_json(data: Any) -> str:
+    """Serialize data as 2-space indented JSON, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(data, indent=2)
+
+
 def save_json_file(data: Dict[str, Any], file_path: Path, indent: int = 2) -> None:
     """Save data to JSON file"""
     file_path.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None and indent == 2:
+        # orjson writes UTF-8 bytes directly, matching ensure_ascii=False
+        file_path.write_bytes(
+            orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        )
+        return
     with open(file_path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=indent, ensure_ascii=False)
 
@@ -222,7 +302,7 @@ def validate_api_key(api_key: Optional[str], provider: str) -> bool:
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt"""
+    """Hash a password using the default scheme (Argon2id)"""
     return pwd_context.hash(password)
 
 
@@ -231,6 +311,55 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if the scheme is outdated"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _warm_hash_worker() -> None:
+    """Load the hashing backend once when a worker process starts"""
+    pwd_context.hash("warmup")
+
+
+def get_hash_executor() -> ProcessPoolExecutor:
+    """Get or create the process pool used for password hashing"""
+    global _hash_executor
+    if _hash_executor is None:
+        from .config import settings
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=settings.password_hash_workers or None,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_hash_worker,
+        )
+    return _hash_executor
+
+
+def shutdown_hash_executor() -> None:
+    """Shut down the password hashing process pool"""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in a worker process, keeping the event loop free"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_hash_executor(), get_password_hash, password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password in a worker process, keeping the event loop free"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_hash_executor(), verify_and_update_password, plain_password, hashed_password
+    )
+
+
 def generate_random_password(length: int = 12) -> str:
     """Generate a random password"""
     alphabet = string.ascii_letters + string.digits + string.punctuation
@@ -0,0 +1,42 @@
+"""
+Approximate nearest neighbour indexes for normalized embeddings (optional faiss)
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:  # pragma: no cover
+    faiss = None
+
+
+ANN_AVAILABLE = faiss is not None
+
+# HNSW graph degree and minimum search beam width
+HNSW_M = 32
+HNSW_EF_SEARCH = 64
+
+
+def build_hnsw_index(embeddings: np.ndarray) -> "faiss.Index":
+    """Build an HNSW index over unit-length rows, where inner product is cosine"""
+    index = faiss.IndexHNSWFlat(embeddings.shape[1], HNSW_M, faiss.METRIC_INNER_PRODUCT)
+    index.add(np.ascontiguousarray(embeddings, dtype=np.float32))
+    return index
+
+
+def search_hnsw_index(
+    index: "faiss.Index",
+    query_embedding: np.ndarray,
+    k: int,
+) -> List[Tuple[int, float]]:
+    """Approximate top-k (row, similarity) pairs for one query, best first"""
+    # The beam must be at least k wide to return k neighbours
+    params = faiss.SearchParametersHNSW(efSearch=max(HNSW_EF_SEARCH, k))
+    scores, indices = index.search(
+        np.ascontiguousarray(np.atleast_2d(query_embedding), dtype=np.float32),
+        k,
+        params=params,
+    )
+    return [(i, score) for i, score in zip(indices[0].tolist(), scores[0].tolist()) if i >= 0]
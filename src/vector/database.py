@@ -1,4 +1,11 @@
+import asyncio
+import copy
+import json
+import threading
+from functools import partial
+
 import chromadb
+from cachetools import TTLCache
 from chromadb.config import Settings as ChromaSettings
 from chromadb.utils import embedding_functions
 from typing import List, Dict, Any, Optional
@@ -33,26 +40,51 @@ class VectorDatabase:
             )
         )
         
+        # Query results cached until the next write through this instance.
+        # Writes by other processes are not seen, so entries also expire after
+        # query_cache_ttl. Queries may run on executor threads, so cache access
+        # is locked
+        self._query_cache: Optional[TTLCache] = (
+            TTLCache(maxsize=settings.query_cache_size, ttl=settings.query_cache_ttl)
+            if settings.cache_queries
+            else None
+        )
+        self._query_cache_lock = threading.Lock()
+        # Bumped after every write so a query that raced a write is not cached
+        self._query_generation = 0
+        
         # Initialize collection
         self.collection = None
         self._init_collection()
 
+    def _invalidate_query_cache(self) -> None:
+        """Drop cached query results after the collection changes"""
+        if self._query_cache is not None:
+            with self._query_cache_lock:
+                self._query_generation += 1
+                self._query_cache.clear()
+
     def _init_collection(self):
         """Initialize or get the collection"""
+        # Existing and new collections embed with the same (possibly GPU) model;
+        # it is only loaded on the first add or query
+        # Chroma persists float32, so stored vectors skip the fp16 rounding
+        # used for in-process similarity
+        from .embeddings import EmbeddingService
+        embedding_function = EmbeddingService(dtype="float32").get_embedding_function()
+        
         try:
             # Try to get existing collection
             self.collection = self.client.get_collection(
                 name=self.collection_name,
+                embedding_function=embedding_function,
             )
             self.logger.info(f"Loaded existing collection: {self.collection_name}")
         except Exception:
             # Create new collection if it doesn't exist
-            from .embeddings import EmbeddingService
-            embedding_service = EmbeddingService()
-            
             self.collection = self.client.create_collection(
                 name=self.collection_name,
-                embedding_function=embedding_service.get_embedding_function(),
+                embedding_function=embedding_function,
                 metadata={"created": get_timestamp()},
             )
             self.logger.info(f"Created new collection: {self.collection_name}")
@@ -75,9 +107,10 @@ class VectorDatabase:
         if metadatas is None:
             metadatas = [{} for _ in documents]
         
-        # Add timestamp to metadata
+        # Add timestamp to metadata (one timestamp for the whole batch)
+        timestamp = get_timestamp()
         for metadata in metadatas:
-            metadata["timestamp"] = get_timestamp()
+            metadata["timestamp"] = timestamp
         
         try:
             self.collection.add(
@@ -85,12 +118,51 @@ class VectorDatabase:
                 metadatas=metadatas,
                 ids=ids,
             )
+            self._invalidate_query_cache()
             self.logger.info(f"Added {len(documents)} documents to collection")
             return ids
         except Exception as e:
             self.logger.error(f"Error adding documents: {e}")
             raise
 
+    async def add_documents_async(
+        self,
+        documents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        batch_size: Optional[int] = None,
+    ) -> List[str]:
+        """Add documents in batches, embedding and writing several batches concurrently"""
+        if not documents:
+            return []
+        
+        batch_size = batch_size or settings.embedding_batch_size
+        if ids is None:
+            ids = [generate_id("doc") for _ in documents]
+        if metadatas is None:
+            metadatas = [{} for _ in documents]
+        
+        # Each batch is embedded and written on a worker thread; the semaphore
+        # bounds how many run at once
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(settings.max_concurrent_embed)
+        
+        async def add_batch(start: int) -> None:
+            end = start + batch_size
+            async with semaphore:
+                await loop.run_in_executor(
+                    None,
+                    partial(
+                        self.add_documents,
+                        documents[start:end],
+                        metadatas[start:end],
+                        ids[start:end],
+                    ),
+                )
+        
+        await asyncio.gather(*(add_batch(start) for start in range(0, len(documents), batch_size)))
+        return ids
+
     def query(
         self,
         query_texts: List[str],
@@ -106,6 +178,22 @@ class VectorDatabase:
         if include is None:
             include = ["documents", "metadatas", "distances"]
         
+        # Query order is kept in the key because results are returned per query
+        cache_key = None
+        if self._query_cache is not None:
+            cache_key = (
+                tuple(query_texts),
+                n_results,
+                json.dumps(where, sort_keys=True, default=str),
+                tuple(include),
+            )
+            with self._query_cache_lock:
+                cached = self._query_cache.get(cache_key)
+                generation = self._query_generation
+            if cached is not None:
+                # Callers own what they get back, so hits are served as copies
+                return copy.deepcopy(cached)
+        
         try:
             results = self.collection.query(
                 query_texts=query_texts,
@@ -114,6 +202,11 @@ class VectorDatabase:
                 include=include,
             )
             
+            if cache_key is not None:
+                with self._query_cache_lock:
+                    if generation == self._query_generation:
+                        self._query_cache[cache_key] = copy.deepcopy(results)
+            
             self.logger.info(
                 f"Queried collection with {len(query_texts)} queries, "
                 f"returned {len(results.get('ids', [[]])[0])} results"
@@ -157,14 +250,16 @@ class VectorDatabase:
         try:
             # Add update timestamp
             if metadatas:
+                timestamp = get_timestamp()
                 for metadata in metadatas:
-                    metadata["updated"] = get_timestamp()
+                    metadata["updated"] = timestamp
             
             self.collection.update(
                 ids=ids,
                 documents=documents,
                 metadatas=metadatas,
             )
+            self._invalidate_query_cache()
             
             self.logger.info(f"Updated {len(ids)} documents")
             return True
@@ -187,6 +282,7 @@ class VectorDatabase:
                 ids=ids,
                 where=where,
             )
+            self._invalidate_query_cache()
             
             self.logger.info(f"Deleted documents from collection")
             return True
@@ -211,6 +307,7 @@ class VectorDatabase:
             
             # Reinitialize
             self._init_collection()
+            self._invalidate_query_cache()
             return True
         except Exception as e:
             self.logger.error(f"Error resetting collection: {e}")
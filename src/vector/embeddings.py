@@ -1,10 +1,22 @@
-from typing import List, Optional, Union, TYPE_CHECKING
+import os
+import threading
+from typing import Dict, List, Optional, Tuple, Union, TYPE_CHECKING
 import numpy as np
+from cachetools import LRUCache
 import logging
 from chromadb.api.types import EmbeddingFunction
 
 from ..config import settings
-from ..utils import setup_logging, Timer
+from ..utils import fingerprint_text, setup_logging, Timer
+
+try:
+    import simsimd
+except ImportError:  # pragma: no cover
+    simsimd = None
+
+# Encode batch sizes on CPU and on CUDA/MPS devices
+DEFAULT_BATCH_SIZE = 32
+ACCELERATOR_BATCH_SIZE = 128
 
 # Lazy import to avoid slow startup
 if TYPE_CHECKING:
@@ -14,30 +26,99 @@ if TYPE_CHECKING:
 class EmbeddingService:
     """Service for generating text embeddings using sentence-transformers"""
 
-    def __init__(self, model_name: Optional[str] = None):
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        dtype: Optional[str] = None,
+        threads: Optional[int] = None,
+    ):
         self.model_name = model_name or settings.embedding_model
+        # Matmul throughput peaks around 4-8 threads; more only oversubscribes
+        self.threads = threads or settings.embedding_threads or min(os.cpu_count() or 1, 8)
+        # fp16 (opt-in) moves half the bytes but rounds scores to ~3 digits
+        self.dtype = np.dtype(dtype or settings.embedding_dtype)
         self.logger = setup_logging("EmbeddingService")
         self.model = None
+        self._model_lock = threading.Lock()
+        self.default_batch_size = DEFAULT_BATCH_SIZE
         # Don't load model immediately - wait until first use
         # self._load_model()
 
     def _load_model(self):
-        """Load the sentence transformer model"""
-        try:
-            # Lazy import here to avoid slow startup
-            from sentence_transformers import SentenceTransformer
+        """Load the sentence transformer model (once, even under concurrent first use)"""
+        with self._model_lock:
+            # Another thread may have finished loading while this one waited
+            if self.model is not None:
+                return
             
-            with Timer(f"Loading embedding model {self.model_name}", self.logger):
-                self.model = SentenceTransformer(self.model_name)
-            self.logger.info(f"Loaded embedding model: {self.model_name}")
+            try:
+                # Lazy import here to avoid slow startup
+                import torch
+                from sentence_transformers import SentenceTransformer
+                
+                torch.set_num_threads(self.threads)
+                try:
+                    torch.set_num_interop_threads(1)
+                except RuntimeError:
+                    # Only settable before the first inter-op parallel work
+                    pass
+                
+                with Timer(f"Loading embedding model {self.model_name}", self.logger):
+                    # ONNX Runtime / OpenVINO run graph-optimized (optionally int8
+                    # quantized) exports, several times faster than eager torch on CPU
+                    model_kwargs = None
+                    if settings.embedding_backend != "torch" and settings.embedding_model_file:
+                        model_kwargs = {"file_name": settings.embedding_model_file}
+                    model = SentenceTransformer(
+                        self.model_name,
+                        device=settings.embedding_device,
+                        backend=settings.embedding_backend,
+                        model_kwargs=model_kwargs,
+                    )
+                    # fp16 halves memory traffic and uses tensor cores; CPUs gain nothing
+                    if (
+                        settings.embedding_half_precision
+                        and settings.embedding_backend == "torch"
+                        and model.device.type == "cuda"
+                    ):
+                        model.half()
+                    if settings.embedding_compile and settings.embedding_backend == "torch":
+                        self._compile_model(model)
+                    # Accelerators stay underutilized at CPU-sized batches
+                    if model.device.type in ("cuda", "mps"):
+                        self.default_batch_size = ACCELERATOR_BATCH_SIZE
+                # Published only once fully set up, so unlocked readers never
+                # see a half-configured model
+                self.model = model
+                self.logger.info(
+                    f"Loaded embedding model: {self.model_name} "
+                    f"({settings.embedding_backend}) on {model.device}"
+                )
+            except Exception as e:
+                self.logger.error(f"Error loading embedding model: {e}")
+                raise
+
+    def _compile_model(self, model: "SentenceTransformer"):
+        """Compile the transformer with torch.compile, keeping eager on failure"""
+        import torch
+        
+        module = model[0]
+        eager = getattr(module, "auto_model", None)
+        if eager is None:
+            return
+        try:
+            # Sequence lengths vary per batch, so compile for dynamic shapes
+            module.auto_model = torch.compile(eager, dynamic=True)
+            # Compilation is lazy; a warm-up call surfaces failures here
+            model.encode(["warm up"])
         except Exception as e:
-            self.logger.error(f"Error loading embedding model: {e}")
-            raise
+            module.auto_model = eager
+            self.logger.warning(f"torch.compile failed, running eager: {e}")
 
     def encode(
         self,
         texts: Union[str, List[str]],
-        batch_size: int = 32,
+        batch_size: Optional[int] = None,
         show_progress: bool = False,
         normalize: bool = True,
     ) -> np.ndarray:
@@ -54,15 +135,17 @@ class EmbeddingService:
         
         try:
             with Timer(f"Encoding {len(texts)} texts", self.logger):
+                # SentenceTransformer.encode already sorts by length to minimize
+                # padding and restores input order, so texts go in unsorted
                 embeddings = self.model.encode(
                     texts,
-                    batch_size=batch_size,
+                    batch_size=batch_size or self.default_batch_size,
                     show_progress_bar=show_progress,
                     normalize_embeddings=normalize,
                 )
             
             self.logger.info(f"Generated {len(embeddings)} embeddings")
-            return embeddings
+            return embeddings.astype(self.dtype, copy=False)
         except Exception as e:
             self.logger.error(f"Error generating embeddings: {e}")
             raise
@@ -70,7 +153,7 @@ class EmbeddingService:
     def encode_queries(
         self,
         queries: Union[str, List[str]],
-        batch_size: int = 32,
+        batch_size: Optional[int] = None,
         normalize: bool = True,
     ) -> np.ndarray:
         """Generate embeddings specifically for queries (may use different pooling)"""
@@ -85,9 +168,9 @@ class EmbeddingService:
         if hasattr(self.model, 'encode_queries'):
             return self.model.encode_queries(
                 queries,
-                batch_size=batch_size,
+                batch_size=batch_size or self.default_batch_size,
                 normalize_embeddings=normalize,
-            )
+            ).astype(self.dtype, copy=False)
         else:
             # Fallback to regular encoding
             return self.encode(queries, batch_size=batch_size, normalize=normalize)
@@ -95,7 +178,7 @@ class EmbeddingService:
     def encode_documents(
         self,
         documents: Union[str, List[str]],
-        batch_size: int = 32,
+        batch_size: Optional[int] = None,
         normalize: bool = True,
     ) -> np.ndarray:
         """Generate embeddings specifically for documents"""
@@ -110,9 +193,9 @@ class EmbeddingService:
         if hasattr(self.model, 'encode_corpus'):
             return self.model.encode_corpus(
                 documents,
-                batch_size=batch_size,
+                batch_size=batch_size or self.default_batch_size,
                 normalize_embeddings=normalize,
-            )
+            ).astype(self.dtype, copy=False)
         else:
             # Fallback to regular encoding
             return self.encode(documents, batch_size=batch_size, normalize=normalize)
@@ -122,8 +205,24 @@ class EmbeddingService:
         embeddings1: np.ndarray,
         embeddings2: np.ndarray,
         metric: str = "cosine",
+        assume_normalized: bool = False,
     ) -> np.ndarray:
-        """Compute similarity between two sets of embeddings"""
+        """Compute similarity between two sets of embeddings
+        
+        With assume_normalized, rows are taken to be unit length (as produced by
+        encode with normalize=True) and cosine similarity is a single matrix product.
+        fp16 inputs stay fp16 in SimSIMD; the BLAS and sklearn paths upcast to fp32.
+        """
+        if assume_normalized and metric == "cosine":
+            metric = "dot"
+        
+        if simsimd is not None and metric in ("cosine", "euclidean", "dot"):
+            return self._simsimd_similarity(embeddings1, embeddings2, metric)
+        
+        # NumPy has no fp16 BLAS kernels
+        embeddings1 = np.asarray(embeddings1, dtype=np.float32)
+        embeddings2 = np.asarray(embeddings2, dtype=np.float32)
+        
         if metric == "cosine":
             # Compute cosine similarity
             from sklearn.metrics.pairwise import cosine_similarity
@@ -138,6 +237,27 @@ class EmbeddingService:
         else:
             raise ValueError(f"Unknown similarity metric: {metric}")
 
+    @staticmethod
+    def _simsimd_similarity(
+        embeddings1: np.ndarray,
+        embeddings2: np.ndarray,
+        metric: str,
+    ) -> np.ndarray:
+        """Pairwise similarity with SimSIMD's fused SIMD distance kernels"""
+        a = np.atleast_2d(np.asarray(embeddings1))
+        b = np.atleast_2d(np.asarray(embeddings2))
+        # SimSIMD has native f16 kernels; anything else is computed in f32
+        dtype = np.float16 if a.dtype == b.dtype == np.float16 else np.float32
+        a = np.ascontiguousarray(a, dtype=dtype)
+        b = np.ascontiguousarray(b, dtype=dtype)
+        
+        if metric == "cosine":
+            return 1.0 - np.asarray(simsimd.cdist(a, b, metric="cosine"))
+        if metric == "euclidean":
+            # Negative for similarity, matching the sklearn path
+            return -np.sqrt(np.asarray(simsimd.cdist(a, b, metric="sqeuclidean")))
+        return np.asarray(simsimd.cdist(a, b, metric="inner"))
+
     def get_embedding_dimension(self) -> int:
         """Get the dimension of the embeddings"""
         # Ensure model is loaded (lazy loading)
@@ -159,7 +279,9 @@ class EmbeddingService:
                 self.embedding_service = embedding_service
             
             def __call__(self, input: List[str]) -> List[List[float]]:
-                embeddings = self.embedding_service.encode(input)
+                embeddings = self.embedding_service.encode(
+                    input, batch_size=settings.embedding_batch_size
+                )
                 return embeddings.tolist()
         
         return ChromaEmbeddingFunction(self)
@@ -174,20 +296,40 @@ class EmbeddingService:
         }
 
 
+def _quantize(embedding: np.ndarray) -> Tuple[np.float32, np.ndarray]:
+    """Symmetric per-vector int8 quantization, returning (scale, int8 vector)"""
+    scale = np.float32(np.abs(embedding).max() / 127) or np.float32(1.0)
+    return scale, np.round(embedding / scale).astype(np.int8)
+
+
 class CachedEmbeddingService(EmbeddingService):
-    """Embedding service with caching support"""
+    """Embedding service with caching support
+    
+    Cached rows are int8-quantized, so a hit returns the dequantized vector
+    rather than the model's output: the same text can embed slightly
+    differently depending on cache state (cosine with the uncached vector
+    stays above 0.9999 for 384-dim unit vectors).
+    """
 
-    def __init__(self, model_name: Optional[str] = None, cache_size: int = 1000):
-        super().__init__(model_name)
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        cache_size: int = 1000,
+        dtype: Optional[str] = None,
+        threads: Optional[int] = None,
+    ):
+        super().__init__(model_name, dtype, threads)
         self.cache_size = cache_size
-        self.cache = {}
+        # Least recently used embeddings are evicted once cache_size is reached.
+        # Entries are int8-quantized, a quarter of the fp32 footprint
+        self.cache = LRUCache(maxsize=cache_size)
         self.cache_hits = 0
         self.cache_misses = 0
 
     def encode(
         self,
         texts: Union[str, List[str]],
-        batch_size: int = 32,
+        batch_size: Optional[int] = None,
         show_progress: bool = False,
         normalize: bool = True,
     ) -> np.ndarray:
@@ -195,45 +337,49 @@ class CachedEmbeddingService(EmbeddingService):
         if isinstance(texts, str):
             texts = [texts]
         
-        embeddings = []
-        texts_to_encode = []
-        text_indices = []
+        if not texts:
+            return np.array([])
+        
+        hits = []
+        # Uncached texts by cache key, each encoded once however often it repeats
+        pending: Dict[Tuple[bytes, bool], Tuple[str, List[int]]] = {}
         
         # Check cache
         for i, text in enumerate(texts):
-            cache_key = f"{text}_{normalize}"
-            if cache_key in self.cache:
-                embeddings.append((i, self.cache[cache_key]))
+            # A fixed-size digest keeps long texts out of the cache keys
+            cache_key = (fingerprint_text(text), normalize)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                hits.append((i, cached))
                 self.cache_hits += 1
             else:
-                texts_to_encode.append(text)
-                text_indices.append(i)
+                pending.setdefault(cache_key, (text, []))[1].append(i)
                 self.cache_misses += 1
         
         # Encode uncached texts
-        if texts_to_encode:
+        new_embeddings = None
+        if pending:
             new_embeddings = super().encode(
-                texts_to_encode,
+                [text for text, _ in pending.values()],
                 batch_size=batch_size,
                 show_progress=show_progress,
                 normalize=normalize,
             )
-            
-            # Update cache
-            for text, embedding, idx in zip(texts_to_encode, new_embeddings, text_indices):
-                cache_key = f"{text}_{normalize}"
-                
-                # Implement simple LRU by removing oldest if cache is full
-                if len(self.cache) >= self.cache_size:
-                    # Remove first (oldest) item
-                    self.cache.pop(next(iter(self.cache)))
-                
-                self.cache[cache_key] = embedding
-                embeddings.append((idx, embedding))
         
-        # Sort by original index and extract embeddings
-        embeddings.sort(key=lambda x: x[0])
-        result = np.array([emb for _, emb in embeddings])
+        # Write every embedding straight into its row of one preallocated
+        # array; the dimension comes from the data so all-hit calls never
+        # load the model
+        dim = new_embeddings.shape[1] if new_embeddings is not None else hits[0][1][1].shape[0]
+        result = np.empty((len(texts), dim), dtype=self.dtype)
+        for i, (scale, qvec) in hits:
+            # Dequantize straight into the output row
+            result[i] = qvec * scale
+        
+        if new_embeddings is not None:
+            # Update cache and fan each embedding out to every position of its text
+            for (cache_key, (_, indices)), embedding in zip(pending.items(), new_embeddings):
+                self.cache[cache_key] = _quantize(embedding)
+                result[indices] = embedding
         
         self.logger.debug(
             f"Cache stats - Hits: {self.cache_hits}, "
@@ -0,0 +1,61 @@
+"""
+Compiled kernels for brute-force embedding scans (requires the optional numba package)
+"""
+
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover
+    njit = None
+
+
+PairFinder = Callable[[np.ndarray, float], Tuple[np.ndarray, np.ndarray, np.ndarray]]
+
+threshold_pairs: Optional[PairFinder] = None
+
+if njit is not None:
+
+    @njit(inline="always", fastmath=True)
+    def _dot(embeddings, i, j):
+        s = np.float32(0.0)
+        for k in range(embeddings.shape[1]):
+            s += embeddings[i, k] * embeddings[j, k]
+        return s
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def threshold_pairs(embeddings, threshold):  # noqa: F811
+        """Find all pairs i < j whose dot product reaches threshold
+
+        Rows are scanned in parallel twice: once to count each row's hits and
+        once to write them at that row's offset, so no similarity matrix is
+        ever materialized and pairs come out in row-major order.
+        """
+        n = embeddings.shape[0]
+        counts = np.zeros(n, dtype=np.int64)
+        for i in prange(n):
+            hits = 0
+            for j in range(i + 1, n):
+                if _dot(embeddings, i, j) >= threshold:
+                    hits += 1
+            counts[i] = hits
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(counts)
+        rows = np.empty(offsets[n], dtype=np.int64)
+        cols = np.empty(offsets[n], dtype=np.int64)
+        scores = np.empty(offsets[n], dtype=np.float32)
+
+        for i in prange(n):
+            pos = offsets[i]
+            for j in range(i + 1, n):
+                s = _dot(embeddings, i, j)
+                if s >= threshold:
+                    rows[pos] = i
+                    cols[pos] = j
+                    scores[pos] = s
+                    pos += 1
+
+        return rows, cols, scores
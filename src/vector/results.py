@@ -0,0 +1,103 @@
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union, overload
+from dataclasses import dataclass
+
+import numpy as np
+
+
+def distances_to_scores(distances: Sequence[float]) -> np.ndarray:
+    """Convert vector DB distances to similarity scores in (0, 1] with one ufunc call"""
+    # Convert distance to similarity score (1 - normalized_distance)
+    return 1.0 / (1.0 + np.asarray(distances, dtype=np.float64))
+
+
+@dataclass
+class SearchResult:
+    """Represents a search result"""
+    id: str
+    document: str
+    metadata: Dict[str, Any]
+    score: float
+    rank: int
+
+
+class SearchResults(Sequence[SearchResult]):
+    """Search hits stored as parallel columns
+
+    SearchResult objects are only built when a hit is first accessed, so
+    parsing a query response costs one vectorized score conversion instead of
+    one object per hit. Each hit is built once and then reused, so changes to
+    a returned SearchResult (e.g. re-ranking) are seen by later accesses.
+    """
+
+    __slots__ = ("ids", "documents", "metadatas", "scores", "ranks", "_built")
+
+    def __init__(
+        self,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        scores: np.ndarray,
+        ranks: np.ndarray,
+    ):
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+        self.scores = scores
+        self.ranks = ranks
+        self._built: List[Optional[SearchResult]] = [None] * len(ids)
+
+    @classmethod
+    def empty(cls) -> "SearchResults":
+        """Results with no hits"""
+        return cls([], [], [], np.empty(0), np.empty(0, dtype=np.int64))
+
+    @classmethod
+    def from_distances(
+        cls,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        distances: List[float],
+    ) -> "SearchResults":
+        """Build results from a vector DB response, ranked in response order"""
+        return cls.from_scores(ids, documents, metadatas, distances_to_scores(distances))
+
+    @classmethod
+    def from_scores(
+        cls,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        scores: np.ndarray,
+    ) -> "SearchResults":
+        """Build results from precomputed scores, ranked in response order"""
+        return cls(ids, documents, metadatas, scores, np.arange(1, len(ids) + 1))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @overload
+    def __getitem__(self, index: int) -> SearchResult: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[SearchResult]: ...
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            # A list of the same objects, so changes made through a slice stick
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        result = self._built[index]
+        if result is None:
+            result = self._built[index] = SearchResult(
+                id=self.ids[index],
+                document=self.documents[index],
+                metadata=self.metadatas[index] or {},
+                score=float(self.scores[index]),
+                rank=int(self.ranks[index]),
+            )
+        return result
+
+    def __iter__(self) -> Iterator[SearchResult]:
+        for i in range(len(self)):
+            yield self[i]
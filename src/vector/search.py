@@ -1,20 +1,26 @@
-from typing import List, Dict, Any, Optional, Tuple
+import heapq
+import threading
+from itertools import chain
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 import logging
-from dataclasses import dataclass
 
+import numpy as np
+from cachetools import LRUCache
+
+from .ann import ANN_AVAILABLE, build_hnsw_index, search_hnsw_index
 from .database import VectorDatabase
 from .embeddings import EmbeddingService, CachedEmbeddingService
-from ..utils import setup_logging, Timer
+from .kernels import threshold_pairs
+from .results import SearchResult, SearchResults, distances_to_scores
+from ..utils import fingerprint_texts, setup_logging, Timer
+
 
+# Document embedding matrices kept for semantic_search / find_duplicates
+DOC_EMBEDDING_CACHE_SIZE = 4
 
-@dataclass
-class SearchResult:
-    """Represents a search result"""
-    id: str
-    document: str
-    metadata: Dict[str, Any]
-    score: float
-    rank: int
+# Corpora from this size on are searched through an HNSW index, which beats
+# brute force once it is reused across queries
+ANN_MIN_DOCUMENTS = 10_000
 
 
 class VectorSearchEngine:
@@ -38,6 +44,11 @@ class VectorSearchEngine:
             self.embedding_service = CachedEmbeddingService()
         else:
             self.embedding_service = EmbeddingService()
+        
+        # Keyed by content digest, so entries never go stale when the corpus changes
+        self._doc_embedding_cache = LRUCache(maxsize=DOC_EMBEDDING_CACHE_SIZE)
+        self._ann_index_cache = LRUCache(maxsize=DOC_EMBEDDING_CACHE_SIZE)
+        self._doc_embedding_lock = threading.Lock()
 
     def index_documents(
         self,
@@ -76,7 +87,7 @@ class VectorSearchEngine:
         n_results: int = 10,
         filter_metadata: Optional[Dict[str, Any]] = None,
         rerank: bool = False,
-    ) -> List[SearchResult]:
+    ) -> Sequence[SearchResult]:
         """Search for similar documents"""
         with Timer(f"Searching for '{query[:50]}...'", self.logger):
             # Query the database
@@ -98,8 +109,12 @@ class VectorSearchEngine:
         n_results: int = 10,
         filter_metadata: Optional[Dict[str, Any]] = None,
         aggregate: str = "none",
-    ) -> Dict[str, List[SearchResult]]:
-        """Search with multiple queries"""
+        limit: Optional[int] = None,
+    ) -> Dict[str, Sequence[SearchResult]]:
+        """Search with multiple queries
+
+        limit caps the number of results returned by union aggregation.
+        """
         if not queries:
             return {}
         
@@ -111,20 +126,23 @@ class VectorSearchEngine:
                 where=filter_metadata,
             )
             
-            # Parse results for each query
-            all_results = {}
-            for i, query in enumerate(queries):
-                query_results = {
-                    "ids": results["ids"][i] if results["ids"] else [],
-                    "documents": results["documents"][i] if results["documents"] else [],
-                    "metadatas": results["metadatas"][i] if results["metadatas"] else [],
-                    "distances": results["distances"][i] if results["distances"] else [],
-                }
-                all_results[query] = self._parse_results(query_results, query, False)
+            # Convert the distances of every query in a single ufunc call,
+            # then split the scores back into per-query rows
+            ids = results["ids"] or [[] for _ in queries]
+            documents = results["documents"] or [[] for _ in queries]
+            metadatas = results["metadatas"] or [[] for _ in queries]
+            distances = results["distances"] or [[] for _ in queries]
+            scores = distances_to_scores(list(chain.from_iterable(distances)))
+            row_scores = np.split(scores, np.cumsum([len(row) for row in distances])[:-1])
+            
+            all_results = {
+                query: SearchResults.from_scores(*row)
+                for query, *row in zip(queries, ids, documents, metadatas, row_scores)
+            }
             
             # Aggregate results if requested
             if aggregate != "none":
-                all_results = self._aggregate_results(all_results, aggregate)
+                all_results = self._aggregate_results(all_results, aggregate, limit)
         
         return all_results
 
@@ -140,26 +158,35 @@ class VectorSearchEngine:
         
         # Generate embeddings
         query_embedding = self.embedding_service.encode_queries(query)
-        doc_embeddings = self.embedding_service.encode_documents(documents)
+        corpus_key = fingerprint_texts(documents)
+        doc_embeddings = self._document_embeddings(documents, corpus_key)
+        
+        if ANN_AVAILABLE and len(documents) >= ANN_MIN_DOCUMENTS:
+            return self._ann_search(
+                corpus_key, query_embedding, doc_embeddings, documents, n_results
+            )
         
-        # Compute similarities
+        # Compute similarities (both encodes return unit-length rows)
         similarities = self.embedding_service.compute_similarity(
             query_embedding,
             doc_embeddings,
+            assume_normalized=True,
         )[0]
         
-        # Sort by similarity
-        indices_scores = [(i, score, documents[i]) 
-                         for i, score in enumerate(similarities)]
-        indices_scores.sort(key=lambda x: x[1], reverse=True)
+        # Select the top n_results in linear time, then sort only those
+        k = min(n_results, len(similarities))
+        if k <= 0:
+            return []
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top], kind="stable")]
         
-        # Return top results
-        return indices_scores[:n_results]
+        return [(i, score, documents[i])
+                for i, score in zip(top.tolist(), similarities[top].tolist())]
 
     def find_duplicates(
         self,
         threshold: float = 0.95,
-        batch_size: int = 100,
+        batch_size: int = 1024,
     ) -> List[Tuple[str, str, float]]:
         """Find duplicate or near-duplicate documents in the database"""
         # Get all documents
@@ -168,41 +195,104 @@ class VectorSearchEngine:
         if not all_docs["ids"]:
             return []
         
-        duplicates = []
         doc_ids = all_docs["ids"]
         doc_texts = all_docs["documents"]
         
         # Generate embeddings for all documents
-        embeddings = self.embedding_service.encode_documents(doc_texts)
-        
-        # Compute pairwise similarities
-        similarities = self.embedding_service.compute_similarity(embeddings, embeddings)
+        embeddings = self._document_embeddings(doc_texts)
         
-        # Find duplicates
-        for i in range(len(doc_ids)):
-            for j in range(i + 1, len(doc_ids)):
-                if similarities[i][j] >= threshold:
-                    duplicates.append((
-                        doc_ids[i],
-                        doc_ids[j],
-                        float(similarities[i][j])
-                    ))
+        if threshold_pairs is not None:
+            # Compiled parallel scan that only ever stores the matching pairs
+            rows, cols, scores = threshold_pairs(
+                np.ascontiguousarray(embeddings, dtype=np.float32), threshold
+            )
+            duplicates = [
+                (doc_ids[i], doc_ids[j], score)
+                for i, j, score in zip(rows.tolist(), cols.tolist(), scores.tolist())
+            ]
+        else:
+            duplicates = self._tiled_duplicates(doc_ids, embeddings, threshold, batch_size)
         
         self.logger.info(f"Found {len(duplicates)} duplicate pairs")
         return duplicates
 
+    def _document_embeddings(
+        self,
+        documents: List[str],
+        key: Optional[bytes] = None,
+    ) -> np.ndarray:
+        """Normalized document embeddings, reused while the documents are unchanged"""
+        key = key or fingerprint_texts(documents)
+        with self._doc_embedding_lock:
+            embeddings = self._doc_embedding_cache.get(key)
+        if embeddings is None:
+            embeddings = self.embedding_service.encode_documents(documents)
+            with self._doc_embedding_lock:
+                self._doc_embedding_cache[key] = embeddings
+        return embeddings
+
+    def _ann_search(
+        self,
+        corpus_key: bytes,
+        query_embedding: np.ndarray,
+        doc_embeddings: np.ndarray,
+        documents: List[str],
+        n_results: int,
+    ) -> List[Tuple[int, float, str]]:
+        """Approximate top-k search through a FAISS HNSW index built once per corpus"""
+        k = min(n_results, len(documents))
+        if k <= 0:
+            return []
+        
+        with self._doc_embedding_lock:
+            index = self._ann_index_cache.get(corpus_key)
+        if index is None:
+            index = build_hnsw_index(doc_embeddings)
+            with self._doc_embedding_lock:
+                self._ann_index_cache[corpus_key] = index
+        
+        return [(i, score, documents[i])
+                for i, score in search_hnsw_index(index, query_embedding, k)]
+
+    def _tiled_duplicates(
+        self,
+        doc_ids: List[str],
+        embeddings: np.ndarray,
+        threshold: float,
+        batch_size: int,
+    ) -> List[Tuple[str, str, float]]:
+        """Find duplicate pairs with blocked similarity matrix products"""
+        # Compare one block of rows at a time against the rows from the block
+        # onward, so only batch_size x N similarities exist at once
+        duplicates = []
+        for start in range(0, len(doc_ids), batch_size):
+            # encode_documents returns unit-length rows
+            block = self.embedding_service.compute_similarity(
+                embeddings[start:start + batch_size],
+                embeddings[start:],
+                assume_normalized=True,
+            )
+            
+            # Keep pairs above the diagonal (j > i), in row-major order
+            rows, cols = np.nonzero(np.triu(block >= threshold, k=1))
+            scores = block[rows, cols]
+            duplicates.extend(
+                (doc_ids[start + i], doc_ids[start + j], score)
+                for i, j, score in zip(rows.tolist(), cols.tolist(), scores.tolist())
+            )
+        
+        return duplicates
+
     def _parse_results(
         self,
         results: Dict[str, Any],
         query: str,
         rerank: bool,
-    ) -> List[SearchResult]:
+    ) -> Sequence[SearchResult]:
         """Parse query results into SearchResult objects"""
-        search_results = []
-        
         # Handle empty results
         if not results.get("ids") or not results["ids"]:
-            return []
+            return SearchResults.empty()
         
         # For single query, results are nested
         ids = results["ids"][0] if isinstance(results["ids"][0], list) else results["ids"]
@@ -210,17 +300,7 @@ class VectorSearchEngine:
         metadatas = results["metadatas"][0] if isinstance(results["metadatas"][0], list) else results["metadatas"]
         distances = results["distances"][0] if isinstance(results["distances"][0], list) else results["distances"]
         
-        for i, (doc_id, doc, meta, dist) in enumerate(zip(ids, documents, metadatas, distances)):
-            # Convert distance to similarity score (1 - normalized_distance)
-            score = 1.0 / (1.0 + dist) if dist else 1.0
-            
-            search_results.append(SearchResult(
-                id=doc_id,
-                document=doc,
-                metadata=meta or {},
-                score=score,
-                rank=i + 1,
-            ))
+        search_results = SearchResults.from_distances(ids, documents, metadatas, distances)
         
         # Rerank if requested
         if rerank:
@@ -230,9 +310,9 @@ class VectorSearchEngine:
 
     def _rerank_results(
         self,
-        results: List[SearchResult],
+        results: Sequence[SearchResult],
         query: str,
-    ) -> List[SearchResult]:
+    ) -> Sequence[SearchResult]:
         """Rerank search results using cross-encoder or other methods"""
         # This is a placeholder for more sophisticated reranking
         # Could use cross-encoder models or other reranking strategies
@@ -242,23 +322,26 @@ class VectorSearchEngine:
 
     def _aggregate_results(
         self,
-        results: Dict[str, List[SearchResult]],
+        results: Dict[str, Sequence[SearchResult]],
         method: str,
-    ) -> Dict[str, List[SearchResult]]:
-        """Aggregate results from multiple queries"""
+        limit: Optional[int] = None,
+    ) -> Dict[str, Sequence[SearchResult]]:
+        """Aggregate results from multiple queries (limit caps union results)"""
         if method == "union":
-            # Combine all unique results
-            seen_ids = set()
-            aggregated = []
-            
+            # Combine all unique results in one pass, keeping each document's
+            # best-scoring hit
+            best: Dict[str, SearchResult] = {}
             for query_results in results.values():
                 for result in query_results:
-                    if result.id not in seen_ids:
-                        seen_ids.add(result.id)
-                        aggregated.append(result)
+                    previous = best.get(result.id)
+                    if previous is None or result.score > previous.score:
+                        best[result.id] = result
             
-            # Re-rank by average score
-            aggregated.sort(key=lambda x: x.score, reverse=True)
+            # Re-rank by score, heap-selecting only the top limit results
+            if limit is None:
+                aggregated = sorted(best.values(), key=lambda x: x.score, reverse=True)
+            else:
+                aggregated = heapq.nlargest(limit, best.values(), key=lambda x: x.score)
             for i, result in enumerate(aggregated):
                 result.rank = i + 1
             
@@ -0,0 +1,92 @@
+"""
+Tests for session and password handling in the auth repositories
+"""
+
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api import app as app_module
+from src.database.auth_repositories import SessionRepository
+from src.database.connection import db_manager
+from src.database.models import Session
+from src.database.user_repository import UserRepository
+from src.utils import pwd_context
+
+
+@pytest.mark.asyncio
+@pytest.mark.database
+class TestExpiredSessionCleanup:
+    """Test expired session cleanup"""
+
+    async def test_cleanup_expired(self, test_session: AsyncSession, test_factory):
+        """Only sessions past their expiry are deleted"""
+        user = await test_factory.create_test_user(test_session)
+        repo = SessionRepository(test_session)
+        expired = await repo.create_session(user.id, "expired-token", expires_in_minutes=-5)
+        live = await repo.create_session(user.id, "live-token", expires_in_minutes=30)
+
+        assert await repo.cleanup_expired() == 1
+
+        remaining = await test_session.scalars(select(Session.id))
+        assert list(remaining) == [live.id]
+        assert await repo.get(expired.id) is None
+
+    async def test_cleanup_loop(self, test_session: AsyncSession, test_factory, monkeypatch):
+        """The lifespan cleanup task deletes expired sessions on its timer"""
+        user = await test_factory.create_test_user(test_session)
+        await SessionRepository(test_session).create_session(
+            user.id, "expired-token", expires_in_minutes=-5
+        )
+
+        cleaned = asyncio.Event()
+
+        @asynccontextmanager
+        async def get_session():
+            yield test_session
+            cleaned.set()
+
+        monkeypatch.setattr(db_manager, "get_session", get_session)
+        task = asyncio.create_task(app_module._session_cleanup_loop(0.01))
+        try:
+            await asyncio.wait_for(cleaned.wait(), timeout=5)
+        finally:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+        assert list(await test_session.scalars(select(Session.id))) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.database
+class TestPasswordRehash:
+    """Test Argon2 hashing and the bcrypt upgrade path"""
+
+    async def test_new_passwords_use_argon2(self, test_session: AsyncSession):
+        """New users get Argon2id hashes that verify"""
+        repo = UserRepository(test_session)
+        user = await repo.create_with_password(
+            username="argon", email="argon@test.com", password="Secret123!"
+        )
+
+        assert user.password_hash.startswith("$argon2id$")
+        assert await repo.verify_password(user, "Secret123!")
+        assert not await repo.verify_password(user, "wrong")
+
+    async def test_bcrypt_hash_upgraded_on_login(self, test_session: AsyncSession, test_factory):
+        """A legacy bcrypt hash verifies and is replaced by Argon2id"""
+        legacy_hash = pwd_context.handler("bcrypt").hash("Legacy123!")
+        user = await test_factory.create_test_user(test_session, password_hash=legacy_hash)
+        repo = UserRepository(test_session)
+
+        assert not await repo.verify_password(user, "wrong")
+        assert user.password_hash == legacy_hash
+
+        assert await repo.verify_password(user, "Legacy123!")
+        await test_session.refresh(user)
+        assert user.password_hash.startswith("$argon2id$")
+        assert await repo.verify_password(user, "Legacy123!")
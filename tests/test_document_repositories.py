@@ -0,0 +1,88 @@
+"""
+Tests for document repositories
+"""
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import document_repositories
+from src.database.document_repositories import DocumentRepository
+from src.database.models import Document, Tag, document_tags
+from src.utils import hash_text_digest
+
+
+@pytest.mark.asyncio
+@pytest.mark.database
+class TestDocumentUpserts:
+    """Test document upserts"""
+
+    async def test_create_with_hash(self, test_session: AsyncSession, test_factory):
+        """Creating a document stores the raw SHA256 digest"""
+        user = await test_factory.create_test_user(test_session)
+        repo = DocumentRepository(test_session)
+
+        document = await repo.create_with_hash(
+            "Some content", title="Doc", owner_id=user.id
+        )
+
+        assert document.id is not None
+        assert document.content_hash == hash_text_digest("Some content")
+
+    async def test_get_by_hash(self, test_session: AsyncSession, test_factory):
+        """Documents are found by raw digest bytes and by hex string"""
+        user = await test_factory.create_test_user(test_session)
+        repo = DocumentRepository(test_session)
+        document = await repo.create_with_hash("Hashed", title="Doc", owner_id=user.id)
+        digest = hash_text_digest("Hashed")
+
+        assert (await repo.get_by_hash(digest)).id == document.id
+        assert (await repo.get_by_hash(digest.hex())).id == document.id
+        assert await repo.get_by_hash(hash_text_digest("Other")) is None
+
+    async def test_create_with_hash_duplicate(
+        self, test_session: AsyncSession, test_factory, monkeypatch
+    ):
+        """Duplicate content returns the existing row and logs a warning"""
+        user = await test_factory.create_test_user(test_session)
+        repo = DocumentRepository(test_session)
+        warnings = []
+        monkeypatch.setattr(document_repositories.logger, "warning", warnings.append)
+
+        first = await repo.create_with_hash("Same content", title="First", owner_id=user.id)
+        assert warnings == []
+        second = await repo.create_with_hash("Same content", title="Second", owner_id=user.id)
+
+        assert second.id == first.id
+        assert second.title == "First"
+        count = await test_session.scalar(select(func.count()).select_from(Document))
+        assert count == 1
+        assert warnings == [f"Document with same content already exists: {first.id}"]
+
+    async def test_add_tags_bulk(self, test_session: AsyncSession, test_factory):
+        """Bulk tagging creates missing tags and skips existing links"""
+        user = await test_factory.create_test_user(test_session)
+        repo = DocumentRepository(test_session)
+        doc_a = await repo.create_with_hash("A", title="A", owner_id=user.id)
+        doc_b = await repo.create_with_hash("B", title="B", owner_id=user.id)
+
+        added = await repo.add_tags_bulk([
+            (doc_a.id, "red"),
+            (doc_a.id, "blue"),
+            (doc_a.id, "red"),
+            (doc_b.id, "red"),
+        ])
+        assert added == 3
+
+        # Existing links and tags are left alone
+        added = await repo.add_tags_bulk([(doc_a.id, "red"), (doc_b.id, "green")])
+        assert added == 1
+
+        names = await test_session.scalars(select(Tag.name).order_by(Tag.name))
+        assert list(names) == ["blue", "green", "red"]
+        links = await test_session.scalar(select(func.count()).select_from(document_tags))
+        assert links == 4
+
+    async def test_add_tags_bulk_empty(self, test_session: AsyncSession):
+        """No pairs means no statements and nothing added"""
+        assert await DocumentRepository(test_session).add_tags_bulk([]) == 0
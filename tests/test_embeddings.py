@@ -0,0 +1,78 @@
+"""
+Unit tests for embedding quantization and caching
+"""
+
+import numpy as np
+import pytest
+
+from src.vector.embeddings import CachedEmbeddingService, _quantize
+
+
+def _unit_rows(n: int, dim: int, seed: int = 0) -> np.ndarray:
+    """Random unit-length rows"""
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((n, dim)).astype(np.float32)
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+
+@pytest.mark.unit
+class TestQuantize:
+    """Test int8 embedding quantization"""
+
+    def test_round_trip(self):
+        """Dequantized values stay within half a quantization step"""
+        embedding = _unit_rows(1, 384)[0]
+        scale, quantized = _quantize(embedding)
+
+        assert quantized.dtype == np.int8
+        assert np.abs(quantized).max() == 127
+        np.testing.assert_allclose(quantized * scale, embedding, atol=scale / 2 + 1e-7)
+
+    def test_zero_vector(self):
+        """All-zero vectors quantize with a unit scale instead of dividing by zero"""
+        scale, quantized = _quantize(np.zeros(8, dtype=np.float32))
+        assert scale == 1.0
+        assert not quantized.any()
+
+
+class _FakeModel:
+    """Stands in for SentenceTransformer with fixed vectors per text"""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self.calls = 0
+
+    def encode(self, texts, batch_size=None, show_progress_bar=False, normalize_embeddings=True):
+        self.calls += 1
+        return np.stack([
+            _unit_rows(1, self.dim, seed=sum(map(ord, text)))[0] for text in texts
+        ])
+
+
+@pytest.mark.unit
+class TestCachedEmbeddingService:
+    """Test cached embedding precision"""
+
+    @pytest.mark.parametrize("dtype", ["float32", "float16"])
+    def test_hit_matches_miss(self, dtype):
+        """A cached (dequantized) embedding has cosine > 0.9999 with the miss"""
+        service = CachedEmbeddingService(dtype=dtype)
+        service.model = _FakeModel()
+        texts = [f"document {i}" for i in range(20)]
+
+        miss = service.encode(texts).astype(np.float32)
+        hit = service.encode(texts).astype(np.float32)
+
+        assert service.model.calls == 1
+        assert service.cache_hits == len(texts)
+        cosine = (miss * hit).sum(axis=1) / (
+            np.linalg.norm(miss, axis=1) * np.linalg.norm(hit, axis=1)
+        )
+        assert cosine.min() > 0.9999
+
+    def test_default_dtype_is_float32(self):
+        """Embeddings and scores keep full precision unless fp16 is opted into"""
+        service = CachedEmbeddingService()
+        service.model = _FakeModel()
+
+        assert service.encode(["text"]).dtype == np.float32
@@ -0,0 +1,388 @@
+"""
+Unit tests for the LLM client base class and provider adapters
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+import pytest_asyncio
+
+from src.llm import openai_client
+from src.llm.base import ChatMessage, LLMClientFactory, LLMConfig, LLMProvider
+from src.llm.http_pool import close_http_clients
+from src.llm.manager import LLMManager
+from src.llm.openai_client import OpenAIClient
+from src.llm.rate_limit import TokenBucket
+
+
+@pytest_asyncio.fixture
+async def make_client():
+    """Build OpenAI clients on the test's loop and close their HTTP pool afterwards"""
+
+    def make(**overrides):
+        params = {"model": "gpt-4", "api_key": "sk-test", **overrides}
+        return OpenAIClient(LLMConfig(provider=LLMProvider.OPENAI, **params))
+
+    yield make
+    await close_http_clients()
+
+
+def _chat_response(text="ok", prompt_tokens=5, completion_tokens=2):
+    """Chat completion shaped like the OpenAI SDK's"""
+    return SimpleNamespace(
+        id="chatcmpl-1",
+        created=0,
+        model="gpt-4",
+        choices=[SimpleNamespace(
+            message=SimpleNamespace(content=text, role="assistant"),
+            finish_reason="stop",
+        )],
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        ),
+    )
+
+
+class _FakeCompletions:
+    """Records create() calls, answering with queued results then a default response"""
+
+    def __init__(self, *results, delay: float = 0.0):
+        self.results = list(results)
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            result = self.results.pop(0) if self.results else _chat_response()
+            if isinstance(result, Exception):
+                raise result
+            return result
+        finally:
+            self.in_flight -= 1
+
+
+def _fake_chat(client, completions: _FakeCompletions) -> _FakeCompletions:
+    """Route the client's chat completions to a fake"""
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return completions
+
+
+def _api_error(error_class, status: int, retry_after=None):
+    """OpenAI SDK error carrying an HTTP response with optional Retry-After"""
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status, headers=headers, request=request)
+    return error_class("error", response=response, body=None)
+
+
+USER = [ChatMessage(role="user", content="hi")]
+
+
+async def _deltas(*chunks):
+    """Async stream of the given deltas"""
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestCoalesce:
+    """Test merging of streamed deltas"""
+
+    async def test_merges_until_size(self, make_client):
+        """Small deltas are joined until the chunk size is reached"""
+        client = make_client(stream_chunk_size=4, stream_flush_interval=60)
+        merged = [text async for text in client._coalesce(_deltas("a", "b", "cd", "e", "f"))]
+        assert merged == ["abcd", "ef"]
+
+    async def test_flushes_on_interval(self, make_client):
+        """A zero flush interval yields every delta as it arrives"""
+        client = make_client(stream_chunk_size=100, stream_flush_interval=0)
+        merged = [text async for text in client._coalesce(_deltas("a", "b", "c"))]
+        assert merged == ["a", "b", "c"]
+
+    async def test_disabled(self, make_client):
+        """A chunk size of 0 passes deltas through unchanged"""
+        client = make_client(stream_chunk_size=0)
+        merged = [text async for text in client._coalesce(_deltas("a", "", "b"))]
+        assert merged == ["a", "", "b"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRequestLimits:
+    """Test the per-client concurrency bound and rate limit"""
+
+    async def test_concurrency_bounded(self, make_client):
+        """No more than max_concurrent requests are in flight at once"""
+        client = make_client(max_concurrent=2)
+        completions = _fake_chat(client, _FakeCompletions(delay=0.01))
+
+        await asyncio.gather(*(client.chat(USER, temperature=1) for _ in range(6)))
+
+        assert len(completions.calls) == 6
+        assert completions.max_in_flight == 2
+
+    async def test_token_bucket_waits(self):
+        """Once the burst capacity is spent, acquire waits for a refill"""
+        bucket = TokenBucket(requests_per_minute=6000, capacity=1)
+        await bucket.acquire()
+        start = time.monotonic()
+        await bucket.acquire()
+        assert time.monotonic() - start >= 0.005
+
+    async def test_token_bucket_disabled(self):
+        """A rate of 0 never waits"""
+        bucket = TokenBucket(requests_per_minute=0)
+        assert not bucket.enabled
+        for _ in range(1000):
+            await bucket.acquire()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestResponseCache:
+    """Test caching of deterministic responses"""
+
+    async def test_deterministic_chat_cached(self, make_client):
+        """A repeated temperature-0 chat is answered from the cache with a copy"""
+        client = make_client()
+        completions = _fake_chat(client, _FakeCompletions())
+
+        first = await client.chat(USER, temperature=0)
+        first.metadata["usage"]["total_tokens"] = -1
+        second = await client.chat(USER, temperature=0)
+
+        assert len(completions.calls) == 1
+        assert second.text == "ok"
+        assert second.metadata["usage"]["total_tokens"] == 7
+
+    async def test_sampled_chat_not_cached(self, make_client):
+        """Requests with temperature > 0 and no seed always reach the API"""
+        client = make_client()
+        completions = _fake_chat(client, _FakeCompletions())
+
+        await client.chat(USER, temperature=0.5)
+        await client.chat(USER, temperature=0.5)
+        await client.chat(USER, temperature=0.5, seed=1)
+        await client.chat(USER, temperature=0.5, seed=1)
+
+        assert len(completions.calls) == 3
+
+    async def test_cache_disabled(self, make_client):
+        """A cache size of 0 turns caching off"""
+        client = make_client(response_cache_size=0)
+        completions = _fake_chat(client, _FakeCompletions())
+
+        await client.chat(USER, temperature=0)
+        await client.chat(USER, temperature=0)
+
+        assert len(completions.calls) == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRetry:
+    """Test retries of provider errors"""
+
+    async def test_retries_rate_limits(self, make_client):
+        """Rate-limited requests are retried until they succeed"""
+        client = make_client()
+        completions = _fake_chat(client, _FakeCompletions(
+            _api_error(openai.RateLimitError, 429, "0"),
+            _api_error(openai.RateLimitError, 429, "0"),
+        ))
+
+        response = await client.chat(USER, temperature=1)
+
+        assert response.text == "ok"
+        assert len(completions.calls) == 3
+
+    async def test_gives_up_after_retry_attempts(self, make_client):
+        """The last error is raised once retry_attempts is used up"""
+        client = make_client(retry_attempts=1)
+        completions = _fake_chat(client, _FakeCompletions(
+            *(_api_error(openai.RateLimitError, 429, "0") for _ in range(3))
+        ))
+
+        with pytest.raises(openai.RateLimitError):
+            await client.chat(USER, temperature=1)
+        assert len(completions.calls) == 2
+
+    async def test_other_errors_not_retried(self, make_client):
+        """Client errors such as a bad request fail on the first attempt"""
+        client = make_client()
+        completions = _fake_chat(client, _FakeCompletions(
+            _api_error(openai.BadRequestError, 400)
+        ))
+
+        with pytest.raises(openai.BadRequestError):
+            await client.chat(USER, temperature=1)
+        assert len(completions.calls) == 1
+
+    async def test_retry_delay(self, make_client):
+        """Retry-After is honoured, otherwise backoff grows with the attempt"""
+        client = make_client()
+        assert client._retry_delay(_api_error(openai.RateLimitError, 429, "2.5"), 0) == 2.5
+        delay = client._retry_delay(_api_error(openai.RateLimitError, 429), 3)
+        assert 4.0 <= delay <= 4.25
+        assert client._retry_delay(openai.APITimeoutError(httpx.Request("GET", "/")), 0) <= 0.75
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSamplingParams:
+    """Test sampling parameters sent with requests"""
+
+    async def test_defaults_and_overrides(self, make_client):
+        """Config values are sent by default and kwargs override or extend them"""
+        client = make_client(top_p=0.9, presence_penalty=0.5)
+        completions = _fake_chat(client, _FakeCompletions())
+
+        await client.chat(USER, temperature=1, top_p=0.2, user="ada")
+
+        sent = completions.calls[0]
+        assert sent["top_p"] == 0.2
+        assert sent["presence_penalty"] == 0.5
+        assert sent["frequency_penalty"] == 0.0
+        assert sent["user"] == "ada"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestManagerFanOut:
+    """Test concurrent chats across managed clients"""
+
+    async def test_chat_all_collects_results_and_errors(self, make_client):
+        """Each client's response or exception is returned under its name"""
+        good, bad = make_client(), make_client(model="gpt-3.5-turbo")
+        _fake_chat(good, _FakeCompletions(_chat_response("from good")))
+        _fake_chat(bad, _FakeCompletions(_api_error(openai.BadRequestError, 400)))
+        manager = LLMManager()
+        manager.add_client("good", good)
+        manager.add_client("bad", bad)
+
+        results = await manager.chat_all(USER, temperature=1)
+
+        assert results["good"].text == "from good"
+        assert isinstance(results["bad"], openai.BadRequestError)
+        assert list(results) == ["good", "bad"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestUsage:
+    """Test provider-reported token usage"""
+
+    async def test_usage_from_response(self, make_client):
+        """tokens_used and last_usage come from the API's usage, not re-tokenizing"""
+        client = make_client()
+        _fake_chat(client, _FakeCompletions(_chat_response(prompt_tokens=11, completion_tokens=4)))
+        assert client.last_usage is None
+
+        response = await client.chat(USER, temperature=1)
+
+        assert response.tokens_used == 15
+        assert client.last_usage == {
+            "prompt_tokens": 11, "completion_tokens": 4, "total_tokens": 15
+        }
+
+
+@pytest.mark.unit
+class TestConfigAndFactory:
+    """Test config validation and client reuse"""
+
+    @pytest.mark.parametrize("overrides", [
+        {"api_key": None},
+        {"max_tokens": 0},
+        {"temperature": 2.5},
+        {"max_concurrent": 0},
+    ])
+    def test_invalid_config(self, overrides):
+        """Invalid settings are rejected when the config is built"""
+        params = {"model": "gpt-4", "api_key": "sk-test", **overrides}
+        with pytest.raises(ValueError):
+            LLMConfig(provider=LLMProvider.OPENAI, **params)
+
+    def test_local_needs_no_key(self):
+        """Local providers may omit the API key"""
+        assert LLMConfig(provider=LLMProvider.LOCAL, model="llama").api_key is None
+
+    def test_fresh_client_outside_loop(self):
+        """Without a running loop every create() builds a new client"""
+        config = LLMConfig(provider=LLMProvider.OPENAI, model="gpt-4", api_key="sk-test")
+        assert LLMClientFactory.create(config) is not LLMClientFactory.create(config)
+
+    @pytest.mark.asyncio
+    async def test_reused_within_loop(self, make_client):
+        """Equal configs share a client on the running loop"""
+        config = LLMConfig(provider=LLMProvider.OPENAI, model="gpt-4", api_key="sk-test")
+        other = LLMConfig(provider=LLMProvider.OPENAI, model="gpt-4", api_key="sk-other")
+
+        client = LLMClientFactory.create(config)
+
+        assert LLMClientFactory.create(config) is client
+        assert LLMClientFactory.create(other) is not client
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestApproximateTokens:
+    """Test token counting without tiktoken"""
+
+    async def test_warns_once(self, make_client, monkeypatch):
+        """The fallback estimate is used and the warning logged only once per client"""
+        client = make_client()
+        warnings = []
+        monkeypatch.setattr(openai_client, "tiktoken", None)
+        monkeypatch.setattr(client.logger, "warning", warnings.append)
+
+        assert await client.count_tokens("abcdefgh") == 2
+        assert await client.count_tokens("abcd") == 1
+
+        assert len(warnings) == 1
+
+
+class _FakeEmbeddings:
+    """Returns one embedding per input, listed in reverse index order"""
+
+    def __init__(self):
+        self.batches = []
+
+    async def create(self, model, input):
+        self.batches.append(list(input))
+        data = [
+            SimpleNamespace(index=i, embedding=[float(len(text))])
+            for i, text in enumerate(input)
+        ]
+        return SimpleNamespace(data=data[::-1])
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestEmbeddings:
+    """Test batched embedding requests"""
+
+    async def test_batches_in_input_order(self, make_client):
+        """Texts are sent in batches and results come back in input order"""
+        client = make_client()
+        embeddings = _FakeEmbeddings()
+        client.client = SimpleNamespace(embeddings=embeddings)
+        texts = ["a" * n for n in range(1, 6)]
+
+        result = await client.get_embeddings(texts, batch_size=2)
+
+        assert embeddings.batches == [texts[0:2], texts[2:4], texts[4:]]
+        assert result == [[1.0], [2.0], [3.0], [4.0], [5.0]]
@@ -0,0 +1,114 @@
+"""
+Unit tests for the LLM provider helper functions
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.llm.anthropic_client import _to_anthropic_messages
+from src.llm.base import ChatMessage, LLMConfig, LLMProvider
+from src.llm.cache import response_cache_key
+from src.llm.openai_client import OpenAIClient, _to_openai_messages, _usage_dict
+from src.llm.pricing import FALLBACK_PRICES, match_prices, pricing_table
+
+
+@pytest.mark.unit
+class TestUsageDict:
+    """Test copying of provider usage into metadata"""
+
+    def test_usage_dict(self):
+        """Usage is copied into a plain dict"""
+        usage = SimpleNamespace(prompt_tokens=3, completion_tokens=1, total_tokens=4)
+        assert _usage_dict(usage) == {
+            "prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4
+        }
+
+    def test_missing_usage(self):
+        """Responses without usage give an empty dict"""
+        assert _usage_dict(None) == {}
+
+
+@pytest.mark.unit
+class TestMessageConversion:
+    """Test conversion of chat messages to provider formats"""
+
+    def test_openai_messages(self):
+        """Roles and contents are passed through in order"""
+        messages = [
+            ChatMessage(role="system", content="be brief"),
+            ChatMessage(role="user", content="hi", name="ada"),
+        ]
+        assert _to_openai_messages(messages) == [
+            {"role": "system", "content": "be brief"},
+            {"role": "user", "content": "hi"},
+        ]
+
+    def test_anthropic_last_system_message_wins(self):
+        """System messages are split out and the last one is used"""
+        messages = [
+            ChatMessage(role="system", content="first"),
+            ChatMessage(role="user", content="hi"),
+            ChatMessage(role="system", content="second"),
+        ]
+        system, converted = _to_anthropic_messages(messages)
+        assert system == "second"
+        assert converted == [{"role": "user", "content": "hi"}]
+
+    def test_anthropic_starts_with_user(self):
+        """A user turn is inserted before a leading assistant message"""
+        system, converted = _to_anthropic_messages(
+            [ChatMessage(role="assistant", content="hello")]
+        )
+        assert system is None
+        assert [msg["role"] for msg in converted] == ["user", "assistant"]
+
+    def test_chat_message_is_slotted_and_hashable(self):
+        """Messages have no __dict__ and hash/compare without metadata"""
+        message = ChatMessage(role="user", content="hi", metadata={"a": 1})
+        assert not hasattr(message, "__dict__")
+        assert message == ChatMessage(role="user", content="hi")
+        assert len({message, ChatMessage(role="user", content="hi")}) == 1
+
+
+@pytest.mark.unit
+class TestPricing:
+    """Test model price lookup"""
+
+    def test_longest_key_matches_first(self):
+        """A specific model key wins over a shorter prefix of it"""
+        assert match_prices("gpt-4-turbo-preview") == (0.01, 0.03)
+        assert match_prices("gpt-4-0613") == (0.03, 0.06)
+
+    def test_fallback(self):
+        """Provider tables fall back to the defaults, then to fixed prices"""
+        table = pricing_table({"my-model": {"input": 1.0, "output": 2.0}})
+        assert match_prices("my-model-v2", table) == (1.0, 2.0)
+        assert match_prices("claude-3-haiku", table) == (0.00025, 0.00125)
+        assert match_prices("unknown", table) == FALLBACK_PRICES
+
+    def test_estimate_cost(self):
+        """Costs use the client's table and are priced per 1K tokens"""
+        client = OpenAIClient(LLMConfig(
+            provider=LLMProvider.OPENAI, model="GPT-4-32k", api_key="sk-test"
+        ))
+        assert client.estimate_cost(1000) == pytest.approx(0.06)
+        assert client.estimate_cost(500, is_input=False) == pytest.approx(0.06)
+
+
+@pytest.mark.unit
+class TestResponseCacheKey:
+    """Test response cache key serialization"""
+
+    def test_stable_under_key_order(self):
+        """Equal requests give the same key whatever the dict ordering"""
+        first = response_cache_key(model="gpt-4", params={"a": 1, "b": [1, 2]})
+        second = response_cache_key(params={"b": [1, 2], "a": 1}, model="gpt-4")
+        assert first == second
+        assert len(first) == 32
+
+    def test_differs_by_params(self):
+        """Any differing parameter changes the key"""
+        base = response_cache_key(model="gpt-4", temperature=0, params={"seed": 1})
+        assert base != response_cache_key(model="gpt-4", temperature=0, params={"seed": 2})
+        assert base != response_cache_key(model="gpt-4", temperature=0.0001, params={"seed": 1})
@@ -0,0 +1,51 @@
+"""
+Unit tests for the shared LLM HTTP connection pools
+"""
+
+import asyncio
+
+import pytest
+
+from src.llm import http_pool
+from src.llm.http_pool import close_http_clients, get_http_client
+
+
+async def _pooled_clients():
+    """Fetch pooled clients on the running loop, then close the loop's pool"""
+    first = get_http_client(None, 30)
+    again = get_http_client(None, 30)
+    other_timeout = get_http_client(None, 10)
+    await close_http_clients()
+    return first, again, other_timeout
+
+
+@pytest.mark.unit
+class TestHttpPool:
+    """Test per-loop sharing of HTTP clients"""
+
+    def test_none_outside_loop(self):
+        """Without a running loop the SDK is left to create its own client"""
+        assert get_http_client(None, 30) is None
+
+    def test_shared_within_loop(self):
+        """One client per (base URL, timeout) on a loop, closed at shutdown"""
+        first, again, other_timeout = asyncio.run(_pooled_clients())
+        assert first is again
+        assert other_timeout is not first
+        assert first.is_closed and other_timeout.is_closed
+
+    def test_separate_per_loop(self):
+        """Each event loop gets its own pool, and a closed loop's pool is dropped"""
+
+        async def fetch():
+            return get_http_client(None, 30)
+
+        first = asyncio.run(fetch())
+        second = asyncio.run(fetch())
+        assert second is not first
+        assert not first.is_closed
+        assert len(http_pool._HTTP_POOLS) == 1
+
+        for client in (first, second):
+            asyncio.run(client.aclose())
+        http_pool._HTTP_POOLS.clear()
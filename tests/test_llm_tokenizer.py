@@ -0,0 +1,153 @@
+"""
+Unit tests for the token counting helpers
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.llm import tokenizer
+from src.llm.base import ChatMessage
+
+
+class _FakeEncoding:
+    """Stands in for a tiktoken encoding with one token per word"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+
+    def encode(self, text):
+        if "<|endoftext|>" in text:
+            raise ValueError("Encountered text corresponding to disallowed special token")
+        return self.encode_ordinary(text)
+
+    def encode_ordinary(self, text):
+        self.calls += 1
+        return text.split()
+
+    def encode_ordinary_batch(self, texts, num_threads=1):
+        return [self.encode_ordinary(text) for text in texts]
+
+
+@pytest.fixture
+def fake_tiktoken(monkeypatch):
+    """Replace tiktoken so no BPE files are downloaded, with fresh caches"""
+    loads = []
+
+    def get_encoding(name):
+        loads.append(name)
+        return _FakeEncoding(name)
+
+    def encoding_for_model(model):
+        if model != "gpt-4":
+            raise KeyError(model)
+        return get_encoding("cl100k_base")
+
+    module = SimpleNamespace(get_encoding=get_encoding, encoding_for_model=encoding_for_model)
+    monkeypatch.setattr(tokenizer, "tiktoken", module)
+    tokenizer.get_encoding.cache_clear()
+    tokenizer.get_encoding_by_name.cache_clear()
+    tokenizer._token_counts.clear()
+    yield loads
+    tokenizer.get_encoding.cache_clear()
+    tokenizer.get_encoding_by_name.cache_clear()
+    tokenizer._token_counts.clear()
+
+
+@pytest.mark.unit
+class TestGetEncoding:
+    """Test encoding lookup and caching"""
+
+    def test_cached_per_model(self, fake_tiktoken):
+        """Repeated lookups reuse the loaded encoding"""
+        assert tokenizer.get_encoding("gpt-4") is tokenizer.get_encoding("gpt-4")
+        assert fake_tiktoken == ["cl100k_base"]
+
+    def test_unknown_model_falls_back(self, fake_tiktoken):
+        """Unknown models and None share the default encoding"""
+        encoding = tokenizer.get_encoding("not-a-model")
+        assert encoding.name == tokenizer.DEFAULT_ENCODING
+        assert tokenizer.get_encoding(None) is encoding
+        assert fake_tiktoken == ["cl100k_base"]
+
+
+@pytest.mark.unit
+class TestCountTokens:
+    """Test memoized token counts"""
+
+    def test_repeated_text_encoded_once(self, fake_tiktoken):
+        """A repeated text is counted from the memo"""
+        encoding = tokenizer.get_encoding("gpt-4")
+        assert tokenizer.count_tokens("one two three", "gpt-4") == 3
+        assert tokenizer.count_tokens("one two three", "gpt-4") == 3
+        assert encoding.calls == 1
+
+    def test_long_text_keyed_by_digest(self, fake_tiktoken):
+        """Long texts are not stored verbatim as keys"""
+        text = "word " * 200
+        assert tokenizer.count_tokens(text) == 200
+        (key,) = tokenizer._token_counts
+        assert key[0] is None
+        assert isinstance(key[1], bytes) and len(key[1]) == 16
+
+    def test_memo_is_bounded(self, fake_tiktoken, monkeypatch):
+        """The least recently used count is evicted first"""
+        monkeypatch.setattr(tokenizer, "TOKEN_COUNT_CACHE_SIZE", 2)
+        tokenizer.count_tokens("a")
+        tokenizer.count_tokens("b")
+        tokenizer.count_tokens("a")
+        tokenizer.count_tokens("c")
+        assert [text for _, text in tokenizer._token_counts] == ["a", "c"]
+
+    def test_special_token_text_counted_as_plain(self, fake_tiktoken):
+        """Text containing a special-token string is counted, not rejected"""
+        assert tokenizer.count_tokens("before <|endoftext|> after") == 3
+
+
+@pytest.mark.unit
+class TestCountMessageTokens:
+    """Test batched chat message counting"""
+
+    def test_overhead_and_content(self, fake_tiktoken):
+        """Per-message, name and reply-priming overhead are added to the batch count"""
+        messages = [
+            ChatMessage(role="system", content="be brief"),
+            ChatMessage(role="user", content="hello there", name="ada"),
+        ]
+        # "system\nbe brief" -> 3 words, "user\nada\nhello there" -> 4 words
+        expected = (
+            3 + 4
+            + 2 * tokenizer.TOKENS_PER_MESSAGE
+            + tokenizer.TOKENS_PER_NAME
+            + tokenizer.REPLY_PRIMING_TOKENS
+        )
+        assert tokenizer.count_message_tokens(messages) == expected
+
+    def test_empty(self, fake_tiktoken):
+        """No messages count as zero tokens"""
+        assert tokenizer.count_message_tokens([]) == 0
+
+
+@pytest.mark.unit
+class TestEstimateTokens:
+    """Test the tokenizer-free estimate"""
+
+    def test_short_text_not_encoded(self, fake_tiktoken):
+        """exact=False estimates short texts without loading an encoding"""
+        assert tokenizer.count_tokens("hello world", exact=False) == 3
+        assert fake_tiktoken == []
+        assert not tokenizer._token_counts
+
+    def test_long_text_still_encoded(self, fake_tiktoken):
+        """exact=False still encodes texts past the fast-path limit"""
+        text = "word " * tokenizer.FAST_PATH_MAX_CHARS
+        assert tokenizer.count_tokens(text, exact=False) == tokenizer.FAST_PATH_MAX_CHARS
+
+    def test_estimate_counts_utf8_bytes(self):
+        """Multi-byte scripts estimate more tokens than their character count suggests"""
+        assert tokenizer.estimate_tokens("") == 0
+        assert tokenizer.estimate_tokens("abcd") == 1
+        assert tokenizer.estimate_tokens("abcde") == 2
+        # 4 CJK characters are 12 UTF-8 bytes
+        assert tokenizer.estimate_tokens("日本語だ") == 3
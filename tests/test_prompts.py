@@ -0,0 +1,126 @@
+"""
+Unit tests for prompt templates and libraries
+"""
+
+import datetime
+import json
+import os
+from string import Template
+
+import pytest
+
+from src.llm.prompts import PromptLibrary, PromptTemplate, _CompiledTemplate
+
+
+TEMPLATES = [
+    "",
+    "No variables here",
+    "Hello $name",
+    "Hello ${name}!",
+    "$greeting, $name. You owe $$5 to ${creditor}.",
+    "Repeated $x and $x and ${x}",
+    "Unknown $missing stays, so does ${also_missing}",
+    "Invalid $ and $1 and ${bad-name} are left as written",
+    "Trailing delimiter $",
+    "$$name is escaped, $name is not",
+]
+
+VALUES = [
+    {},
+    {"name": "Ada"},
+    {"name": "Ada", "greeting": "Hi", "creditor": "Bob", "x": 1},
+    {"name": 42, "x": None, "missing": "$name"},
+]
+
+
+@pytest.mark.unit
+class TestCompiledTemplate:
+    """Test _CompiledTemplate against string.Template"""
+
+    @pytest.mark.parametrize("source", TEMPLATES)
+    @pytest.mark.parametrize("values", VALUES)
+    def test_matches_safe_substitute(self, source, values):
+        """Rendering matches Template.safe_substitute"""
+        expected = Template(source).safe_substitute(values)
+        assert _CompiledTemplate(source).render(values) == expected
+
+    def test_render_specializations(self):
+        """Zero- and one-slot templates get specialized renderers"""
+        assert _CompiledTemplate("static").render.__name__ == "_render_static"
+        assert _CompiledTemplate("$one").render.__name__ == "_render_single"
+        assert _CompiledTemplate("$one $two").render.__name__ == "_render_slots"
+
+    def test_recompiles_when_template_changes(self):
+        """Reassigning the template invalidates the compiled form"""
+        prompt = PromptTemplate(name="greeting", template="Hello $name")
+        assert prompt.format(name="Ada") == "Hello Ada"
+
+        prompt.template = "Bye $name"
+        assert prompt.format(name="Ada") == "Bye Ada"
+
+
+@pytest.mark.unit
+class TestTemplateFileCache:
+    """Test the JSON sidecar cache for YAML template files"""
+
+    YAML = (
+        "templates:\n"
+        "- name: greet\n"
+        "  template: Hello $name\n"
+    )
+
+    def test_sidecar_written_and_reused(self, tmp_path):
+        """The first load writes the sidecar and later loads read it"""
+        path = tmp_path / "prompts.yaml"
+        path.write_text(self.YAML)
+
+        PromptLibrary().load_from_file(path)
+        sidecar = tmp_path / "prompts.yaml.json"
+        assert json.loads(sidecar.read_text())["templates"][0]["name"] == "greet"
+
+        # A newer sidecar wins over the YAML
+        data = {"templates": [{"name": "greet", "template": "From cache $name"}]}
+        sidecar.write_text(json.dumps(data))
+        os.utime(sidecar, (path.stat().st_mtime + 1,) * 2)
+        library = PromptLibrary()
+        library.load_from_file(path)
+        assert library.get_template("greet").template == "From cache $name"
+
+    def test_non_json_metadata_loads_without_sidecar(self, tmp_path):
+        """YAML dates load fine; the sidecar is skipped and no partial file is left"""
+        path = tmp_path / "prompts.yaml"
+        path.write_text(self.YAML + "  metadata:\n    created: 2024-01-01\n")
+
+        library = PromptLibrary()
+        library.load_from_file(path)
+
+        metadata = library.get_template("greet").metadata
+        assert metadata["created"] == datetime.date(2024, 1, 1)
+        assert [p.name for p in tmp_path.iterdir()] == ["prompts.yaml"]
+
+    def test_save_with_non_json_metadata(self, tmp_path):
+        """Saving YAML succeeds even when the sidecar cannot be written"""
+        library = PromptLibrary()
+        library.add_template(PromptTemplate(
+            name="dated",
+            template="Hi $name",
+            metadata={"created": datetime.date(2024, 1, 1)},
+        ))
+        path = tmp_path / "prompts.yaml"
+        library.save_to_file(path)
+
+        loaded = PromptLibrary()
+        loaded.load_from_file(path)
+        assert loaded.get_template("dated").template == "Hi $name"
+
+    def test_invalid_sidecar_data_raises(self, tmp_path):
+        """Bad template data in a fresh sidecar is reported, not re-parsed from YAML"""
+        path = tmp_path / "prompts.yaml"
+        path.write_text(self.YAML)
+        sidecar = tmp_path / "prompts.yaml.json"
+        data = {"templates": [{"name": "greet", "template": "x", "type": "bogus"}]}
+        sidecar.write_text(json.dumps(data))
+        os.utime(sidecar, (path.stat().st_mtime + 1,) * 2)
+
+        with pytest.raises(ValueError):
+            PromptLibrary().load_from_file(path)
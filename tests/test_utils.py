@@ -0,0 +1,94 @@
+"""
+Unit tests for utility helpers
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from src import utils
+from src.utils import (
+    chunk_text,
+    get_hash_executor,
+    get_password_hash_async,
+    pwd_context,
+    shutdown_hash_executor,
+    verify_and_update_password_async,
+)
+
+
+def _reference_chunks(text: str, chunk_size: int, overlap: int) -> list:
+    """Chunk by stepping until a chunk reaches the end of the text"""
+    chunks = []
+    start = 0
+    while start < len(text):
+        chunks.append(text[start:start + chunk_size])
+        if start + chunk_size >= len(text):
+            break
+        start += chunk_size - overlap
+    return chunks
+
+
+@pytest.mark.unit
+class TestChunkText:
+    """Test chunk_text"""
+
+    @pytest.mark.parametrize("length", [0, 1, 99, 100, 101, 180, 181, 1000, 1001])
+    @pytest.mark.parametrize("chunk_size,overlap", [(100, 20), (100, 0), (10, 9)])
+    def test_matches_reference(self, length, chunk_size, overlap):
+        """Chunks cover the text with the requested overlap"""
+        text = "".join(chr(ord("a") + i % 26) for i in range(length))
+        assert chunk_text(text, chunk_size, overlap) == _reference_chunks(
+            text, chunk_size, overlap
+        )
+
+    def test_last_chunk_reaches_end(self):
+        """No trailing chunk is contained in the previous one"""
+        chunks = chunk_text("x" * 250, chunk_size=100, overlap=20)
+        assert [len(chunk) for chunk in chunks] == [100, 100, 90]
+
+    @pytest.mark.parametrize("overlap", [100, 150])
+    def test_rejects_overlap_not_below_chunk_size(self, overlap):
+        """Overlap must leave a positive step"""
+        with pytest.raises(ValueError):
+            chunk_text("text", chunk_size=100, overlap=overlap)
+
+
+def _worker_pid() -> int:
+    """Process ID of the worker that runs this"""
+    return os.getpid()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestPasswordHashPool:
+    """Test password hashing in the process pool"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_pool(self):
+        """Each test starts and ends without a pool"""
+        shutdown_hash_executor()
+        yield
+        shutdown_hash_executor()
+
+    async def test_hash_and_verify_in_workers(self):
+        """Hashes made in worker processes verify, and bcrypt hashes get upgraded"""
+        password_hash = await get_password_hash_async("Secret123!")
+        assert pwd_context.verify("Secret123!", password_hash)
+
+        legacy_hash = pwd_context.handler("bcrypt").hash("Secret123!")
+        valid, new_hash = await verify_and_update_password_async("Secret123!", legacy_hash)
+        assert valid and new_hash.startswith("$argon2id$")
+        assert await verify_and_update_password_async("wrong", legacy_hash) == (False, None)
+
+    async def test_pool_is_shared_and_out_of_process(self):
+        """One pool serves every call, runs in other processes and is recreated after shutdown"""
+        executor = get_hash_executor()
+        assert isinstance(executor, ProcessPoolExecutor)
+        assert get_hash_executor() is executor
+        assert executor.submit(_worker_pid).result(timeout=60) != os.getpid()
+
+        shutdown_hash_executor()
+        assert utils._hash_executor is None
+        assert get_hash_executor() is not executor
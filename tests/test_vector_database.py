@@ -0,0 +1,88 @@
+"""
+Unit tests for the vector database query cache
+"""
+
+import pytest
+from cachetools import TTLCache
+
+from src.vector import database as database_module
+from src.vector.database import VectorDatabase
+
+
+class _FakeCollection:
+    """Records queries and returns a fresh result each time"""
+
+    def __init__(self):
+        self.queries = 0
+
+    def query(self, query_texts, n_results, where, include):
+        self.queries += 1
+        return {
+            "ids": [[f"doc{self.queries}"]],
+            "documents": [["text"]],
+            "metadatas": [[{"source": "test"}]],
+            "distances": [[0.1]],
+        }
+
+    def add(self, documents, metadatas, ids):
+        pass
+
+
+class _FakeClient:
+    """Stands in for chromadb.PersistentClient"""
+
+    def __init__(self, path, settings):
+        self.collection = _FakeCollection()
+
+    def get_collection(self, name, embedding_function):
+        return self.collection
+
+
+class _Clock:
+    """Manually advanced timer for TTLCache"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def vector_db(tmp_path, monkeypatch):
+    """VectorDatabase over a fake Chroma client"""
+    monkeypatch.setattr(database_module.chromadb, "PersistentClient", _FakeClient)
+    return VectorDatabase(persist_directory=tmp_path, collection_name="test")
+
+
+@pytest.mark.unit
+class TestQueryCache:
+    """Test VectorDatabase query caching"""
+
+    def test_repeated_query_is_cached(self, vector_db):
+        """Identical queries hit Chroma once and are served as copies"""
+        first = vector_db.query(["hello"])
+        first["ids"][0].append("mutated")
+        second = vector_db.query(["hello"])
+
+        assert vector_db.collection.queries == 1
+        assert second["ids"] == [["doc1"]]
+
+    def test_write_invalidates(self, vector_db):
+        """A write through the same instance drops cached results"""
+        vector_db.query(["hello"])
+        vector_db.add_documents(["new document"])
+
+        assert vector_db.query(["hello"])["ids"] == [["doc2"]]
+        assert vector_db.collection.queries == 2
+
+    def test_entries_expire(self, vector_db):
+        """Writes by other processes are seen once the TTL has passed"""
+        clock = _Clock()
+        vector_db._query_cache = TTLCache(maxsize=8, ttl=30, timer=clock)
+
+        vector_db.query(["hello"])
+        clock.now = 29
+        assert vector_db.query(["hello"])["ids"] == [["doc1"]]
+        clock.now = 31
+        assert vector_db.query(["hello"])["ids"] == [["doc2"]]
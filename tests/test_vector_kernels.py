@@ -0,0 +1,75 @@
+"""
+Unit tests for the duplicate scan kernels
+"""
+
+import numpy as np
+import pytest
+
+from src.vector.embeddings import EmbeddingService
+from src.vector.kernels import threshold_pairs
+from src.vector.search import VectorSearchEngine
+
+
+def _unit_rows(n: int, dim: int, seed: int = 0) -> np.ndarray:
+    """Random unit-length rows"""
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((n, dim)).astype(np.float32)
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+
+def _with_duplicates(n: int, dim: int) -> np.ndarray:
+    """Random unit-length rows with near-duplicates planted at 0/1/n//2 and 3/n-1"""
+    embeddings = _unit_rows(n, dim)
+    embeddings[1] = embeddings[0] + 0.01
+    embeddings[n - 1] = embeddings[3] + 0.01
+    embeddings[n // 2] = embeddings[0]
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+
+def _tiled_duplicates(doc_ids, embeddings, threshold, batch_size):
+    """Run the NumPy fallback without a vector database"""
+    engine = VectorSearchEngine.__new__(VectorSearchEngine)
+    engine.embedding_service = EmbeddingService(dtype="float32")
+    return engine._tiled_duplicates(doc_ids, embeddings, threshold, batch_size)
+
+
+@pytest.mark.unit
+class TestDuplicateScan:
+    """Test the compiled kernel against the tiled NumPy path"""
+
+    @pytest.mark.parametrize("batch_size", [1, 7, 64])
+    def test_tiled_finds_planted_pairs(self, batch_size):
+        """Blocked scan finds the same pairs whatever the block size"""
+        embeddings = _with_duplicates(40, 16)
+        doc_ids = [f"doc{i}" for i in range(len(embeddings))]
+
+        pairs = _tiled_duplicates(doc_ids, embeddings, 0.95, batch_size)
+
+        found = {(a, b) for a, b, _ in pairs}
+        planted = {("doc0", "doc1"), ("doc0", "doc20"), ("doc1", "doc20"), ("doc3", "doc39")}
+        assert planted <= found
+        assert all(doc_ids.index(a) < doc_ids.index(b) for a, b in found)
+
+    @pytest.mark.parametrize("threshold", [0.95, 0.3, -1.0])
+    def test_kernel_matches_tiled(self, threshold):
+        """Compiled kernel returns the same pairs, in the same order"""
+        if threshold_pairs is None:
+            pytest.skip("numba is not installed")
+        embeddings = _with_duplicates(40, 16)
+        doc_ids = [f"doc{i}" for i in range(len(embeddings))]
+
+        rows, cols, scores = threshold_pairs(embeddings, threshold)
+        expected = _tiled_duplicates(doc_ids, embeddings, threshold, 7)
+
+        assert [(doc_ids[i], doc_ids[j]) for i, j in zip(rows, cols)] == [
+            (a, b) for a, b, _ in expected
+        ]
+        np.testing.assert_allclose(scores, [s for _, _, s in expected], atol=1e-5)
+
+    def test_kernel_no_pairs(self):
+        """Fewer than two rows yield empty arrays"""
+        if threshold_pairs is None:
+            pytest.skip("numba is not installed")
+        rows, cols, scores = threshold_pairs(_unit_rows(1, 8), 0.0)
+        assert len(rows) == len(cols) == len(scores) == 0
+